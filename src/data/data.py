@@ -1,3 +1,154 @@
+import hashlib
+import heapq
+from collections import Counter
+from decimal import Decimal
+from fractions import Fraction
+from itertools import chain
+import math
+import mmap
+import numbers
+import os
+import pickle
+import struct
+import tempfile
+
+
+# Archivos en los que se reparten los elementos en cada nivel de la deduplicación externa
+_PARTICIONES_EXTERNAS = 64
+# Niveles de repartición a partir de los que una partición se procesa aunque supere la memoria
+_NIVELES_EXTERNOS = 3
+# Corridas que se abren a la vez al mezclarlas, para no agotar los descriptores de archivo
+_FUSION_MAXIMA = 64
+# Hasta este valor de len(conjunto1) * len(conjunto2) es_subconjunto compara directamente
+_UMBRAL_SUBCONJUNTO_LINEAL = 4096
+
+
+def _huella(elemento):
+    """
+    Huella hashable de un elemento, coherente con ==: dos elementos iguales
+    siempre tienen la misma huella (dos distintos pueden compartirla).
+    """
+    try:
+        return hash(elemento)
+    except TypeError:
+        pass
+    if isinstance(elemento, (list, tuple)):
+        return hash((len(elemento),) + tuple(_huella(x) for x in elemento))
+    if isinstance(elemento, dict):
+        return hash(frozenset((clave, _huella(valor)) for clave, valor in elemento.items()))
+    if isinstance(elemento, set):
+        return hash(frozenset(elemento))
+    if isinstance(elemento, bytearray):
+        return hash(bytes(elemento))
+    # Otros tipos no hashables comparten una sola cubeta por tipo
+    return 0
+
+
+def _codificar(elemento):
+    """
+    Bytes que representan a un elemento junto con su tipo, iguales en cualquier
+    proceso (a diferencia de hash(), que varía entre ejecuciones para str y bytes).
+    Dos elementos dan los mismos bytes cuando son del mismo tipo y ==, como las
+    claves de eliminar_duplicados.
+    """
+    tipo = type(elemento)
+    codigo = _codificar_igualdad(elemento)
+    if codigo is None:
+        codigo = repr(elemento).encode('utf-8', 'surrogatepass')
+    return f"{tipo.__module__}.{tipo.__qualname__}:".encode() + codigo
+
+
+def _concatenar(partes):
+    """
+    Une codificaciones precedidas de su longitud, así la concatenación no es ambigua.
+    """
+    return b''.join(len(parte).to_bytes(8, 'little') + parte for parte in partes)
+
+
+def _codificar_numero(numero):
+    """
+    Codificación de un número coherente con ==: los valores reales se llevan a su
+    fracción exacta, de modo que 1, 1.0, True, Fraction(2, 2) y complex(1, 0)
+    coinciden, igual que 0.5 y Fraction(1, 2) o 0.0 y -0.0. Devuelve None si el
+    tipo no se sabe normalizar.
+    """
+    if isinstance(numero, numbers.Complex) and not isinstance(numero, numbers.Real):
+        if numero.imag:
+            real, imaginaria = _codificar_numero(numero.real), _codificar_numero(numero.imag)
+            if real is None or imaginaria is None:
+                return None
+            return b'c' + _concatenar([real, imaginaria])
+        numero = numero.real
+    if isinstance(numero, numbers.Integral):
+        return b'i' + str(int(numero)).encode()
+    if isinstance(numero, numbers.Rational):
+        fraccion = Fraction(numero.numerator, numero.denominator)
+    elif isinstance(numero, (numbers.Real, Decimal)):
+        if numero != numero:
+            # NaN no es igual a nada, cualquier codificación vale
+            return b'nan'
+        if numero in (math.inf, -math.inf):
+            return b'f' + repr(float(numero)).encode()
+        fraccion = Fraction(numero) if isinstance(numero, (float, Decimal)) else Fraction(float(numero))
+    else:
+        return None
+    if fraccion.denominator == 1:
+        return b'i' + str(fraccion.numerator).encode()
+    return b'q' + f"{fraccion.numerator}/{fraccion.denominator}".encode()
+
+
+def _codificar_igualdad(elemento):
+    """
+    Bytes que representan a un elemento de forma coherente con ==: dos elementos
+    iguales dan siempre los mismos bytes, en cualquier proceso. Los números se
+    normalizan (1, 1.0 y True coinciden), b"x" y bytearray(b"x") también, y los
+    diccionarios y conjuntos no dependen del orden de sus elementos.
+    
+    Returns:
+        bytes: La codificación, o None si el tipo no tiene una coherente con ==
+    """
+    if elemento is None:
+        return b'n'
+    if isinstance(elemento, str):
+        return b's' + elemento.encode('utf-8', 'surrogatepass')
+    if isinstance(elemento, (bytes, bytearray)):
+        return b'b' + bytes(elemento)
+    if isinstance(elemento, (numbers.Number, Decimal)):
+        return _codificar_numero(elemento)
+    if isinstance(elemento, (list, tuple)):
+        partes = [_codificar_igualdad(x) for x in elemento]
+        if None in partes:
+            return None
+        return (b'l' if isinstance(elemento, list) else b't') + _concatenar(partes)
+    if isinstance(elemento, (set, frozenset)):
+        # set y frozenset iguales comparten etiqueta; se ordenan las codificaciones
+        partes = [_codificar_igualdad(x) for x in elemento]
+        if None in partes:
+            return None
+        return b'S' + _concatenar(sorted(partes))
+    if isinstance(elemento, dict):
+        partes = []
+        for clave, valor in elemento.items():
+            pares = (_codificar_igualdad(clave), _codificar_igualdad(valor))
+            if None in pares:
+                return None
+            partes.append(_concatenar(pares))
+        return b'd' + _concatenar(sorted(partes))
+    return None
+
+
+def _leer_pares(ruta):
+    """
+    Lee uno a uno los objetos serializados con pickle en un archivo.
+    """
+    with open(ruta, 'rb') as archivo:
+        while True:
+            try:
+                yield pickle.load(archivo)
+            except EOFError:
+                return
+
+
 class Data:
     """
     Clase con métodos para operaciones y manipulaciones de estructuras de datos.
@@ -29,7 +180,7 @@ class Data:
         
         return lista_copia
     
-    def buscar_elemento(self, lista, elemento):
+    def buscar_elemento(self, lista, elemento, filtro=None):
         """
         Busca un elemento en una lista y devuelve su índice (o -1 si no existe).
         Implementación manual sin usar index().
@@ -37,35 +188,177 @@ class Data:
         Args:
             lista (list): Lista donde buscar
             elemento: Elemento a buscar
+            filtro (FiltroBloom, optional): Filtro con los elementos de la lista; si
+                descarta el elemento no se recorre la lista
             
         Returns:
             int: Índice del elemento o -1 si no se encuentra
         """
         if not lista:
             return -1
+        if filtro is not None and elemento not in filtro:
+            return -1
         for i in range (len(lista)):
             if lista[i]==elemento:
                 return i
         return -1
     
-    def eliminar_duplicados(self, lista):
+    def eliminar_duplicados(self, lista, key=None):
         """
-        Elimina elementos duplicados de una lista sin usar set().
-        Mantiene el orden original de aparición.
+        Elimina elementos duplicados de una lista.
+        Mantiene el orden original de aparición y distingue valores iguales de
+        tipos distintos (1 y True se conservan ambos).
         
         Args:
             lista (list): Lista con posibles duplicados
+            key (callable, optional): Función que da la clave con la que se comparan los elementos
             
         Returns:
             list: Lista sin elementos duplicados
         """
-        elim_duplicado = []
-        elementos_vistos = []
-        for elemento in lista:
-            if (elemento, type(elemento)) not in elementos_vistos:
-                elim_duplicado.append(elemento)
-                elementos_vistos.append((elemento, type(elemento)))
-        return elim_duplicado
+        return list(self.iter_sin_duplicados(lista, key))
+    
+    def iter_sin_duplicados(self, iterable, key=None):
+        """
+        Genera perezosamente los elementos de un iterable sin repetidos, en orden de aparición.
+        Los elementos hashables se llevan en un conjunto; los no hashables (listas,
+        diccionarios...) en un índice por huella estructural, así solo se comparan
+        con == los que comparten huella.
+        
+        Args:
+            iterable (iterable): Elementos con posibles duplicados
+            key (callable, optional): Función que da la clave con la que se comparan los elementos
+            
+        Yields:
+            El primer elemento de cada clave distinta
+        """
+        vistos = set()
+        # (tipo, huella) -> claves no hashables ya vistas con esa huella
+        indice = {}
+        for elemento in iterable:
+            clave = elemento if key is None else key(elemento)
+            try:
+                if (clave, type(clave)) in vistos:
+                    continue
+                vistos.add((clave, type(clave)))
+            except TypeError:
+                cubeta = indice.setdefault((type(clave), _huella(clave)), [])
+                if any(vista is clave or vista == clave for vista in cubeta):
+                    continue
+                cubeta.append(clave)
+            yield elemento
+    
+    def eliminar_duplicados_externo(self, iterable, memoria=1 << 26, directorio=None, key=None):
+        """
+        Elimina duplicados de un flujo que puede no caber en memoria, en orden de aparición.
+        Si el flujo supera el presupuesto, los elementos se reparten por la huella
+        de su clave en archivos temporales, cada archivo se deduplica por separado
+        y el resultado se mezcla por posición original.
+        
+        Args:
+            iterable (iterable): Elementos con posibles duplicados (deben poder serializarse con pickle)
+            memoria (int): Presupuesto aproximado en bytes para los elementos en memoria
+            directorio (str, optional): Carpeta para los archivos temporales
+            key (callable, optional): Función que da la clave con la que se comparan los elementos
+            
+        Yields:
+            El primer elemento de cada clave distinta, en el orden original
+        """
+        pares = enumerate(iterable)
+        en_memoria = []
+        tamano = 0
+        for par in pares:
+            en_memoria.append(par)
+            tamano += len(pickle.dumps(par, pickle.HIGHEST_PROTOCOL))
+            if tamano > memoria:
+                break
+        else:
+            # Todo el flujo cupo en el presupuesto
+            yield from self.iter_sin_duplicados((elemento for _, elemento in en_memoria), key)
+            return
+        
+        clave_de = (lambda par: par[1]) if key is None else (lambda par: key(par[1]))
+        with tempfile.TemporaryDirectory(dir=directorio) as carpeta:
+            particiones = self._particionar(chain(en_memoria, pares), clave_de, carpeta, 0)
+            del en_memoria
+            corridas = []
+            for ruta in particiones:
+                corridas.extend(self._deduplicar_particion(ruta, clave_de, memoria, carpeta, 0))
+            corridas = self._reducir_corridas(corridas, carpeta)
+            lectores = [_leer_pares(ruta) for ruta in corridas]
+            for _, elemento in heapq.merge(*lectores, key=lambda par: par[0]):
+                yield elemento
+    
+    def _reducir_corridas(self, corridas, carpeta):
+        """
+        Mezcla las corridas por posición en pasadas de a lo sumo _FUSION_MAXIMA
+        archivos, hasta que quedan pocas como para abrirlas todas a la vez.
+        """
+        while len(corridas) > _FUSION_MAXIMA:
+            siguientes = []
+            for i in range(0, len(corridas), _FUSION_MAXIMA):
+                grupo = corridas[i:i + _FUSION_MAXIMA]
+                with tempfile.NamedTemporaryFile(dir=carpeta, delete=False) as mezcla:
+                    for par in heapq.merge(*[_leer_pares(ruta) for ruta in grupo], key=lambda par: par[0]):
+                        pickle.dump(par, mezcla, pickle.HIGHEST_PROTOCOL)
+                for ruta in grupo:
+                    os.remove(ruta)
+                siguientes.append(mezcla.name)
+            corridas = siguientes
+        return corridas
+    
+    def _particionar(self, pares, clave_de, carpeta, nivel):
+        """
+        Reparte pares (posición, elemento) en archivos según la huella de su clave,
+        de modo que los duplicados caen siempre en el mismo archivo y en orden.
+        """
+        # Los archivos se crean al recibir su primer par, así no quedan particiones vacías
+        archivos = {}
+        try:
+            for par in pares:
+                indice = hash((nivel, _huella(clave_de(par)))) % _PARTICIONES_EXTERNAS
+                if indice not in archivos:
+                    archivos[indice] = tempfile.NamedTemporaryFile(dir=carpeta, delete=False)
+                pickle.dump(par, archivos[indice], pickle.HIGHEST_PROTOCOL)
+        finally:
+            for archivo in archivos.values():
+                archivo.close()
+        return [archivo.name for archivo in archivos.values()]
+    
+    def _deduplicar_particion(self, ruta, clave_de, memoria, carpeta, nivel):
+        """
+        Deduplica un archivo de partición y devuelve los archivos con los pares que
+        sobreviven, cada uno ordenado por posición. Las particiones que superan el
+        presupuesto se vuelven a repartir con otra semilla.
+        """
+        if os.path.getsize(ruta) > memoria and nivel < _NIVELES_EXTERNOS:
+            subparticiones = self._particionar(_leer_pares(ruta), clave_de, carpeta, nivel + 1)
+            os.remove(ruta)
+            corridas = []
+            for subruta in subparticiones:
+                corridas.extend(self._deduplicar_particion(subruta, clave_de, memoria, carpeta, nivel + 1))
+            return corridas
+        with tempfile.NamedTemporaryFile(dir=carpeta, delete=False) as corrida:
+            for par in self.iter_sin_duplicados(_leer_pares(ruta), clave_de):
+                pickle.dump(par, corrida, pickle.HIGHEST_PROTOCOL)
+        os.remove(ruta)
+        return [corrida.name]
+    
+    def contar_distintos(self, iterable, precision=14):
+        """
+        Estima cuántos elementos distintos tiene un flujo sin guardarlos, con HyperLogLog.
+        El error relativo típico es 1.04 / √(2^precision), alrededor de 0.8% por defecto.
+        
+        Args:
+            iterable (iterable): Elementos a contar
+            precision (int): Bits de índice del sketch (entre 4 y 18)
+            
+        Returns:
+            int: Cantidad aproximada de elementos distintos
+        """
+        sketch = HyperLogLog(precision)
+        sketch.agregar_todos(iterable)
+        return sketch.cardinalidad()
     
     def merge_ordenado(self, lista1, lista2):
         """
@@ -134,20 +427,101 @@ class Data:
         suma_actual = sum(lista)
         return suma_esperada - suma_actual
     
-    def es_subconjunto(self, conjunto1, conjunto2):
+    def es_subconjunto(self, conjunto1, conjunto2, multiconjunto=False, filtro=None):
         """
-        Verifica si conjunto1 es subconjunto de conjunto2 sin usar set.
+        Verifica si conjunto1 es subconjunto de conjunto2.
+        Elige el algoritmo según los datos: recorrido directo para listas muy
+        pequeñas, índice hash para elementos hashables y, para los no hashables,
+        ordenación por huella estructural y mezcla de ambos lados.
         
         Args:
             conjunto1 (list): Posible subconjunto
             conjunto2 (list): Conjunto principal
+            multiconjunto (bool): Si es True cada elemento de conjunto2 solo puede
+                cubrir una aparición en conjunto1 (también deben alcanzar las repeticiones)
+            filtro (FiltroBloom, optional): Filtro con los elementos de conjunto2; si
+                descarta algún elemento de conjunto1 no se consulta conjunto2
             
         Returns:
             bool: True si conjunto1 es subconjunto de conjunto2, False en caso contrario
         """
+        conjunto1 = conjunto1 if isinstance(conjunto1, (list, tuple)) else list(conjunto1)
+        if filtro is not None and not all(elemento in filtro for elemento in conjunto1):
+            return False
+        conjunto2 = conjunto2 if isinstance(conjunto2, (list, tuple)) else list(conjunto2)
+        if not conjunto1:
+            return True
+        if multiconjunto and len(conjunto1) > len(conjunto2):
+            return False
+        if not multiconjunto and len(conjunto1) * len(conjunto2) <= _UMBRAL_SUBCONJUNTO_LINEAL:
+            # Con tan pocos elementos construir un índice cuesta más que comparar
+            for elemento in conjunto1:
+                if elemento not in conjunto2:
+                    return False
+            return True
+        try:
+            if multiconjunto:
+                disponibles = Counter(conjunto2)
+                return all(disponibles[elemento] >= veces for elemento, veces in Counter(conjunto1).items())
+            if len(conjunto1) > len(conjunto2):
+                # Se indexa el lado mayor y se recorre el menor
+                pendientes = set(conjunto1)
+                pendientes.difference_update(conjunto2)
+                return not pendientes
+            return set(conjunto2).issuperset(conjunto1)
+        except TypeError:
+            return self._es_subconjunto_mixto(conjunto1, conjunto2, multiconjunto)
+    
+    def _es_subconjunto_mixto(self, conjunto1, conjunto2, multiconjunto):
+        """
+        es_subconjunto cuando hay elementos no hashables: los hashables se resuelven
+        con un índice y el resto por ordenación y mezcla de sus huellas.
+        """
+        disponibles = Counter()
+        resto2 = []
+        for elemento in conjunto2:
+            try:
+                disponibles[elemento] += 1
+            except TypeError:
+                resto2.append(elemento)
+        resto1 = []
         for elemento in conjunto1:
-            if elemento not in conjunto2:
+            try:
+                if disponibles[elemento] > 0:
+                    if multiconjunto:
+                        disponibles[elemento] -= 1
+                    continue
+            except TypeError:
+                pass
+            resto1.append(elemento)
+        if not resto1:
+            return True
+        # Un no hashable puede ser igual a un hashable (bytearray y bytes, set y frozenset)
+        huellas = {_huella(elemento) for elemento in resto1}
+        for elemento, veces in disponibles.items():
+            if veces > 0 and _huella(elemento) in huellas:
+                resto2.extend([elemento] * (veces if multiconjunto else 1))
+        
+        ordenados1 = sorted(((_huella(elemento), elemento) for elemento in resto1), key=lambda par: par[0])
+        ordenados2 = sorted(((_huella(elemento), elemento) for elemento in resto2), key=lambda par: par[0])
+        j = 0
+        grupo, huella_grupo = [], None
+        for huella, elemento in ordenados1:
+            if huella != huella_grupo:
+                # Avanzamos en conjunto2 hasta el grupo con la misma huella
+                while j < len(ordenados2) and ordenados2[j][0] < huella:
+                    j += 1
+                grupo = []
+                while j < len(ordenados2) and ordenados2[j][0] == huella:
+                    grupo.append(ordenados2[j][1])
+                    j += 1
+                huella_grupo = huella
+            posicion = next((k for k, candidato in enumerate(grupo)
+                             if candidato is elemento or candidato == elemento), None)
+            if posicion is None:
                 return False
+            if multiconjunto:
+                del grupo[posicion]
         return True
     
     def implementar_pila(self):
@@ -245,4 +619,302 @@ class Data:
             for j in range(columnas):
                 transpuesta[j][i] = matriz[i][j]
         
-        return transpuesta
\ No newline at end of file
+        return transpuesta
+
+
+class HyperLogLog:
+    """
+    Sketch HyperLogLog para estimar la cantidad de elementos distintos de un flujo.
+    Guarda 2^precision registros de un byte, así que ocupa unos pocos KB sin
+    importar el tamaño del flujo, y dos sketches de la misma precisión se pueden
+    fusionar (por ejemplo, los de varios procesos trabajadores).
+    """
+    
+    def __init__(self, precision=14):
+        """
+        Args:
+            precision (int): Bits de índice (entre 4 y 18); el error relativo típico es 1.04 / √(2^precision)
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError("La precisión debe estar entre 4 y 18")
+        self.precision = precision
+        self.registros = bytearray(1 << precision)
+    
+    def agregar(self, elemento):
+        """
+        Agrega un elemento al sketch. Como en eliminar_duplicados, valores iguales
+        de tipos distintos (1 y True) cuentan por separado.
+        
+        Args:
+            elemento: Elemento a agregar
+        """
+        h = int.from_bytes(hashlib.blake2b(_codificar(elemento), digest_size=8).digest(), 'little')
+        indice = h & ((1 << self.precision) - 1)
+        # Posición del primer bit en 1 de los 64 - precision bits restantes
+        rango = 65 - self.precision - (h >> self.precision).bit_length()
+        if rango > self.registros[indice]:
+            self.registros[indice] = rango
+    
+    def agregar_todos(self, iterable):
+        """
+        Agrega todos los elementos de un iterable.
+        
+        Args:
+            iterable (iterable): Elementos a agregar
+        """
+        for elemento in iterable:
+            self.agregar(elemento)
+    
+    def cardinalidad(self):
+        """
+        Estima la cantidad de elementos distintos agregados.
+        
+        Returns:
+            int: Cantidad aproximada de elementos distintos
+        """
+        m = len(self.registros)
+        alfa = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        suma = sum(self.registros.count(r) * 2.0 ** -r for r in range(66 - self.precision))
+        estimacion = alfa * m * m / suma
+        vacios = self.registros.count(0)
+        if estimacion <= 2.5 * m and vacios:
+            # Corrección para cardinalidades pequeñas (conteo lineal)
+            estimacion = m * math.log(m / vacios)
+        return round(estimacion)
+    
+    def fusionar(self, otro):
+        """
+        Incorpora los elementos de otro sketch, como si se hubieran agregado a este.
+        
+        Args:
+            otro (HyperLogLog): Sketch con la misma precisión
+            
+        Returns:
+            HyperLogLog: Este mismo sketch
+        """
+        if otro.precision != self.precision:
+            raise ValueError("Solo se pueden fusionar sketches con la misma precisión")
+        self.registros = bytearray(map(max, self.registros, otro.registros))
+        return self
+    
+    def a_bytes(self):
+        """
+        Serializa el sketch: un byte con la precisión seguido de los registros.
+        
+        Returns:
+            bytes: Estado del sketch
+        """
+        return bytes([self.precision]) + self.registros
+    
+    @classmethod
+    def desde_bytes(cls, datos):
+        """
+        Reconstruye un sketch serializado con a_bytes.
+        
+        Args:
+            datos (bytes): Estado del sketch
+            
+        Returns:
+            HyperLogLog: El sketch reconstruido
+        """
+        if not datos:
+            raise ValueError("El tamaño de los datos no coincide con la precisión")
+        sketch = cls(datos[0])
+        if len(datos) != 1 + len(sketch.registros):
+            raise ValueError("El tamaño de los datos no coincide con la precisión")
+        sketch.registros[:] = datos[1:]
+        return sketch
+
+
+class FiltroBloom:
+    """
+    Filtro de Bloom: responde si un elemento puede estar en una colección sin
+    guardarla. Nunca da falsos negativos y los falsos positivos se mantienen
+    cerca de la tasa pedida mientras no se supere la capacidad.
+    
+    Los bits viven en un bytearray o, si se indica una ruta, en un archivo
+    mapeado con mmap, de modo que el filtro puede ser mayor que la memoria
+    disponible y compartirse entre procesos.
+    
+    Los elementos sin una codificación coherente con == (ver _codificar_igualdad)
+    no pueden descartarse: si se consultan la respuesta es siempre "quizá", y si se
+    agregan y su tipo redefine ==, el filtro deja de descartar cualquier consulta.
+    """
+    
+    FIRMA = b'FBLOOM01'
+    # Firma, cantidad de funciones hash, bits, elementos agregados y elementos
+    # agregados sin codificación que podrían ser iguales a otros
+    _CABECERA = struct.Struct('<8sIQQI')
+    
+    def __init__(self, capacidad, tasa_error=0.01, ruta=None):
+        """
+        Args:
+            capacidad (int): Cantidad de elementos que se espera agregar
+            tasa_error (float): Tasa de falsos positivos buscada con esa capacidad (entre 0 y 1)
+            ruta (str, optional): Archivo que respalda los bits; se crea o se sobrescribe
+        """
+        if capacidad <= 0:
+            raise ValueError("La capacidad debe ser positiva")
+        if not 0 < tasa_error < 1:
+            raise ValueError("La tasa de error debe estar entre 0 y 1")
+        # Tamaño óptimo: m = -n ln(p) / ln(2)^2 bits y k = (m / n) ln(2) funciones
+        bits = math.ceil(-capacidad * math.log(tasa_error) / math.log(2) ** 2)
+        bits = -(-bits // 8) * 8
+        funciones = max(1, round(bits / capacidad * math.log(2)))
+        self._iniciar(bits, funciones, 0, ruta, bytearray(bits // 8))
+    
+    def _iniciar(self, bits, funciones, cantidad, ruta, datos):
+        """
+        Prepara el almacenamiento de los bits, en memoria o en un archivo mapeado.
+        """
+        self.bits = bits
+        self.funciones = funciones
+        self.cantidad = cantidad
+        self.inciertos = 0
+        self._mapa = None
+        if ruta is None:
+            self._datos = datos
+            self._inicio = 0
+            return
+        with open(ruta, 'w+b') as archivo:
+            archivo.write(self._cabecera())
+            archivo.write(datos)
+            archivo.flush()
+            self._mapa = mmap.mmap(archivo.fileno(), 0)
+        self._datos = self._mapa
+        self._inicio = self._CABECERA.size
+    
+    def _cabecera(self):
+        """
+        Cabecera del archivo con el estado actual del filtro.
+        """
+        return self._CABECERA.pack(self.FIRMA, self.funciones, self.bits, self.cantidad, self.inciertos)
+    
+    def _posiciones(self, codigo):
+        """
+        Bits de una codificación por doble hash: h1 + i * h2 para i = 0, ..., k - 1.
+        """
+        resumen = hashlib.blake2b(codigo, digest_size=16).digest()
+        h1 = int.from_bytes(resumen[:8], 'little')
+        h2 = int.from_bytes(resumen[8:], 'little') | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.funciones)]
+    
+    def agregar(self, elemento):
+        """
+        Agrega un elemento al filtro.
+        
+        Args:
+            elemento: Elemento a agregar
+        """
+        self.cantidad += 1
+        codigo = _codificar_igualdad(elemento)
+        if codigo is None:
+            # Con la igualdad por identidad de object nadie más puede ser igual a él
+            if type(elemento).__eq__ is not object.__eq__:
+                self.inciertos += 1
+            return
+        datos, inicio = self._datos, self._inicio
+        for posicion in self._posiciones(codigo):
+            datos[inicio + (posicion >> 3)] |= 1 << (posicion & 7)
+    
+    def agregar_todos(self, iterable):
+        """
+        Agrega todos los elementos de un iterable.
+        
+        Args:
+            iterable (iterable): Elementos a agregar
+        """
+        for elemento in iterable:
+            self.agregar(elemento)
+    
+    def __contains__(self, elemento):
+        """
+        Returns:
+            bool: False si el elemento seguro no fue agregado, True si probablemente sí
+        """
+        codigo = _codificar_igualdad(elemento)
+        if codigo is None or self.inciertos:
+            return True
+        datos, inicio = self._datos, self._inicio
+        return all(datos[inicio + (posicion >> 3)] >> (posicion & 7) & 1
+                   for posicion in self._posiciones(codigo))
+    
+    def tasa_estimada(self):
+        """
+        Tasa de falsos positivos esperada con los elementos agregados hasta ahora.
+        
+        Returns:
+            float: (1 - e^(-k n / m))^k
+        """
+        return (1 - math.exp(-self.funciones * self.cantidad / self.bits)) ** self.funciones
+    
+    def guardar(self, ruta):
+        """
+        Guarda el filtro en disco, reemplazando el archivo de forma atómica.
+        
+        Args:
+            ruta (str): Archivo de destino
+        """
+        if self._mapa is not None:
+            self._mapa[:self._CABECERA.size] = self._cabecera()
+            self._mapa.flush()
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        try:
+            with open(temporal, 'wb') as archivo:
+                archivo.write(self._cabecera())
+                archivo.write(self._datos[self._inicio:self._inicio + self.bits // 8])
+            os.replace(temporal, ruta)
+        finally:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+    
+    @classmethod
+    def cargar(cls, ruta, mapear=False):
+        """
+        Lee un filtro guardado con guardar.
+        
+        Args:
+            ruta (str): Archivo de origen
+            mapear (bool): Si es True los bits se usan directamente desde el archivo
+                con mmap (los cambios se escriben en él) en lugar de copiarse a memoria
+            
+        Returns:
+            FiltroBloom: El filtro leído
+        """
+        with open(ruta, 'r+b' if mapear else 'rb') as archivo:
+            cabecera = archivo.read(cls._CABECERA.size)
+            try:
+                firma, funciones, bits, cantidad, inciertos = cls._CABECERA.unpack(cabecera)
+            except struct.error:
+                raise ValueError("El archivo no es un filtro de Bloom compatible") from None
+            if firma != cls.FIRMA or bits == 0 or bits % 8:
+                raise ValueError("El archivo no es un filtro de Bloom compatible")
+            if os.fstat(archivo.fileno()).st_size != cls._CABECERA.size + bits // 8:
+                raise ValueError("El tamaño del archivo no coincide con su cabecera")
+            filtro = cls.__new__(cls)
+            filtro.bits, filtro.funciones, filtro.cantidad = bits, funciones, cantidad
+            filtro.inciertos = inciertos
+            if mapear:
+                filtro._mapa = filtro._datos = mmap.mmap(archivo.fileno(), 0)
+                filtro._inicio = cls._CABECERA.size
+            else:
+                filtro._mapa = None
+                filtro._datos = bytearray(archivo.read())
+                filtro._inicio = 0
+        return filtro
+    
+    def cerrar(self):
+        """
+        Escribe la cabecera y libera el archivo mapeado, si lo hay.
+        """
+        if self._mapa is not None:
+            self._mapa[:self._CABECERA.size] = self._cabecera()
+            self._mapa.close()
+            self._mapa = None
+            self._datos = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *_):
+        self.cerrar()
@@ -1,12 +1,1235 @@
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import compress, count
+import math
+import mmap
+import multiprocessing
+import operator
+import os
+import shutil
+from multiprocessing import shared_memory
+import struct
+import sys
+import time
+import zlib
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él se trabaja con array.array o listas
+    np = None
+
+# Tamaño de cada segmento de la criba, medido en números impares (un byte por
+# impar). 128 KiB caben holgadamente en la caché L2 de los procesadores actuales.
+_TAMANO_SEGMENTO = 1 << 17
+
+
+def _primos_base(limite):
+    """
+    Criba de Eratóstenes simple (solo impares) de los primos menores o iguales a limite.
+
+    Args:
+        limite (int): Límite superior (incluido)
+
+    Returns:
+        list: Lista ordenada de los primos hasta limite
+    """
+    if limite < 2:
+        return []
+    # criba[i] representa al impar 2*i + 1
+    n = (limite + 1) // 2
+    criba = bytearray([1]) * n
+    criba[0] = 0  # El 1 no es primo
+    for i in range(1, (math.isqrt(limite) + 1) // 2):
+        if criba[i]:
+            p = 2 * i + 1
+            inicio = p * p // 2
+            criba[inicio::p] = bytes((n - 1 - inicio) // p + 1)
+    return [2] + list(compress(range(1, limite + 1, 2), criba))
+
+
+def _segmentos_criba(inicio, hi, tamano=_TAMANO_SEGMENTO, base=None):
+    """
+    Criba de Eratóstenes segmentada sobre los impares de [inicio, hi).
+
+    Cada segmento es un bytearray de `tamano` entradas (solo el último puede ser
+    más corto) donde la posición i vale 1 si inicio + 2i es primo, así la memoria
+    usada no depende del tamaño del intervalo.
+
+    Args:
+        inicio (int): Primer impar del intervalo
+        hi (int): Fin del intervalo (excluido)
+        tamano (int): Cantidad de impares por segmento
+        base (sequence): Primos impares en orden creciente hasta al menos √(hi - 1);
+                         si no se indica se calculan
+
+    Yields:
+        tuple: (inicio del segmento, bytearray del segmento)
+    """
+    if hi <= inicio:
+        return
+    if base is None:
+        # Primos impares necesarios para tachar compuestos menores que hi
+        base = _primos_base(math.isqrt(hi - 1))[1:]
+
+    while inicio < hi:
+        fin = min(inicio + 2 * tamano, hi)
+        n = (fin - inicio + 1) // 2  # Impares en [inicio, fin)
+        segmento = bytearray([1]) * n
+        if inicio == 1:
+            segmento[0] = 0  # El 1 no es primo
+        for p in base:
+            primero = p * p
+            if primero >= fin:
+                break
+            if primero < inicio:
+                # Primer múltiplo impar de p dentro del segmento
+                primero = -(-inicio // p) * p
+                if primero % 2 == 0:
+                    primero += p
+            i = (primero - inicio) // 2
+            if i < n:
+                segmento[i::p] = bytes((n - 1 - i) // p + 1)
+        yield inicio, segmento
+        inicio = fin
+
+
+def _iter_primos_segmentado(lo, hi, tamano=_TAMANO_SEGMENTO):
+    """
+    Criba de Eratóstenes segmentada que genera los primos de [lo, hi) en orden.
+
+    Args:
+        lo (int): Inicio del intervalo (incluido)
+        hi (int): Fin del intervalo (excluido)
+        tamano (int): Cantidad de impares por segmento
+
+    Yields:
+        int: Los números primos del intervalo en orden creciente
+    """
+    lo = max(lo, 2)
+    if hi <= lo:
+        return
+    if lo == 2:
+        yield 2
+        lo = 3
+    if lo % 2 == 0:
+        lo += 1
+    for inicio, segmento in _segmentos_criba(lo, hi, tamano):
+        yield from compress(range(inicio, inicio + 2 * len(segmento), 2), segmento)
+
+
+# Primos pequeños para la división previa a Miller-Rabin. Con un solo mcd contra
+# su producto se descartan la mayoría de los compuestos.
+_PRIMOS_PEQUENOS = frozenset(_primos_base(251))
+_PRODUCTO_PRIMOS_PEQUENOS = math.prod(_PRIMOS_PEQUENOS)
+_MAYOR_PRIMO_PEQUENO = max(_PRIMOS_PEQUENOS)
+
+# Testigos con los que Miller-Rabin es determinista para todo n < 2^64
+_TESTIGOS_64 = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+# Tope de la criba completa que usa es_primo_lote para lotes densos
+_LIMITE_CRIBA_LOTE = 1 << 26
+
+
+def _miller_rabin(n, a, d, s):
+    """
+    Prueba fuerte de probable primo de n en base a, con n - 1 = d * 2^s y d impar.
+    """
+    x = pow(a, d, n)
+    if x == 1 or x == n - 1:
+        return True
+    for _ in range(s - 1):
+        x = x * x % n
+        if x == n - 1:
+            return True
+    return False
+
+
+def _jacobi(a, n):
+    """
+    Símbolo de Jacobi (a/n) para n impar positivo.
+    """
+    a %= n
+    resultado = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                resultado = -resultado
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            resultado = -resultado
+        a %= n
+    return resultado if n == 1 else 0
+
+
+def _lucas_fuerte(n):
+    """
+    Prueba fuerte de probable primo de Lucas con los parámetros de Selfridge.
+    Junto con Miller-Rabin en base 2 forma la prueba BPSW.
+    """
+    if math.isqrt(n) ** 2 == n:
+        return False
+    # Buscamos D en 5, -7, 9, -11, ... con (D/n) = -1
+    D = 5
+    while True:
+        j = _jacobi(D, n)
+        if j == -1:
+            break
+        if j == 0 and abs(D) != n:
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+    P, Q = 1, (1 - D) // 4
+
+    d, s = n + 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    # Cálculo binario de U_d, V_d y Q^d módulo n
+    U, V, Qk = 1, P, Q % n
+    for bit in bin(d)[3:]:
+        U = U * V % n
+        V = (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if bit == '1':
+            U, V = P * U + V, D * U + P * V
+            if U % 2:
+                U += n
+            U = (U // 2) % n
+            if V % 2:
+                V += n
+            V = (V // 2) % n
+            Qk = Qk * Q % n
+
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V = (V * V - 2 * Qk) % n
+        if V == 0:
+            return True
+        Qk = Qk * Qk % n
+    return False
+
+
+def _fibonacci_doble(n, m=0):
+    """
+    Método de duplicación rápida: devuelve (F(n), F(n+1)), opcionalmente módulo m.
+    Usa F(2k) = F(k) * (2F(k+1) - F(k)) y F(2k+1) = F(k)^2 + F(k+1)^2.
+    """
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if m:
+            c %= m
+            d %= m
+        if bit == '1':
+            a, b = d, c + d
+            if m:
+                b %= m
+        else:
+            a, b = c, d
+    return a, b
+
+
+def _iter_fibonacci(n):
+    """
+    Genera los primeros n números de Fibonacci en una sola pasada.
+    """
+    a, b = 0, 1
+    for _ in range(n):
+        yield a
+        a, b = b, a + b
+
+
+# A partir de este grado los polinomios módulo m se multiplican por sustitución de
+# Kronecker (una sola multiplicación de enteros grandes) en lugar de término a término
+_UMBRAL_KRONECKER = 32
+
+
+def _multiplicar_polinomios(a, b, m=0):
+    """
+    Producto de dos polinomios dados como listas de coeficientes (grado creciente),
+    opcionalmente módulo m.
+    """
+    if m and min(len(a), len(b)) >= _UMBRAL_KRONECKER:
+        # Cada coeficiente del producto es menor que min(len) * (m - 1)^2
+        ancho = (2 * (m - 1).bit_length() + min(len(a), len(b)).bit_length() + 7) // 8
+        x = int.from_bytes(b''.join(c.to_bytes(ancho, 'little') for c in a), 'little')
+        y = int.from_bytes(b''.join(c.to_bytes(ancho, 'little') for c in b), 'little')
+        datos = (x * y).to_bytes(ancho * (len(a) + len(b) - 1), 'little')
+        return [int.from_bytes(datos[i:i + ancho], 'little') % m
+                for i in range(0, len(datos), ancho)]
+    producto = [0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        if x:
+            for j, y in enumerate(b):
+                producto[i + j] += x * y
+    if m:
+        producto = [c % m for c in producto]
+    return producto
+
+
+def _inverso_serie(f, precision, m):
+    """
+    Inverso de la serie f (con f[0] == 1) módulo x^precision y módulo m, por Newton.
+    """
+    g = [1]
+    t = 1
+    while t < precision:
+        t = min(2 * t, precision)
+        e = [-c % m for c in _multiplicar_polinomios(f[:t], g, m)[:t]]
+        e[0] = (e[0] + 2) % m
+        g = _multiplicar_polinomios(g, e, m)[:t]
+    return g
+
+
+class _ReductorRecurrencia:
+    """
+    Reduce polinomios módulo el polinomio característico
+    P(x) = x^k - c1*x^(k-1) - ... - ck de una recurrencia lineal.
+    """
+    
+    def __init__(self, coeficientes, m=0):
+        self.k = len(coeficientes)
+        self.m = m
+        self.coeficientes = coeficientes
+        self.rapido = bool(m) and self.k >= _UMBRAL_KRONECKER
+        if self.rapido:
+            # Parte baja C(x) = c1*x^(k-1) + ... + ck, de modo que P(x) = x^k - C(x)
+            self.baja = [c % m for c in reversed(coeficientes)]
+            inverso = [1] + [-c % m for c in coeficientes]
+            self.inverso = _inverso_serie(inverso, self.k - 1, m)
+    
+    def reducir(self, a):
+        """
+        Devuelve a mod P(x) con exactamente k coeficientes.
+        """
+        k, m = self.k, self.m
+        if len(a) <= k:
+            return a + [0] * (k - len(a))
+        if self.rapido:
+            # División rápida: el cociente sale de invertir P invertido como serie
+            longitud = len(a) - k
+            cociente = _multiplicar_polinomios(a[:k - 1:-1][:longitud], self.inverso[:longitud], m)
+            cociente = cociente[:longitud][::-1]
+            resto = _multiplicar_polinomios(cociente, self.baja, m)
+            return [(x + y) % m for x, y in zip(a[:k], resto[:k] + [0] * (k - len(resto)))]
+        a = list(a)
+        # x^i = x^(i-k) * x^k equivale a c1*x^(i-1) + ... + ck*x^(i-k)
+        for i in range(len(a) - 1, k - 1, -1):
+            t = a[i]
+            if t:
+                for j, c in enumerate(self.coeficientes, 1):
+                    a[i - j] += t * c
+        resto = a[:k]
+        if m:
+            resto = [c % m for c in resto]
+        return resto
+    
+    def potencia_x(self, n):
+        """
+        Calcula x^n mod P(x) por cuadrados sucesivos.
+        """
+        r = self.reducir([1])
+        for bit in bin(n)[2:]:
+            r = self.reducir(_multiplicar_polinomios(r, r, self.m))
+            if bit == '1':
+                r = self.reducir([0] + r)
+        return r
+
+
+def _validar_recurrencia(coeficientes, iniciales, modulo):
+    """
+    Comprueba los parámetros de una recurrencia lineal y los devuelve como tuplas.
+    """
+    coeficientes, iniciales = tuple(coeficientes), tuple(iniciales)
+    if not coeficientes or len(coeficientes) != len(iniciales):
+        raise ValueError("Se necesitan tantos términos iniciales como coeficientes")
+    if modulo is not None and modulo <= 0:
+        raise ValueError("El módulo debe ser positivo")
+    return coeficientes, iniciales
+
+
+def _termino_recurrencia(coeficientes, iniciales, n, m=0):
+    """
+    Término n de a(i) = c1*a(i-1) + ... + ck*a(i-k) por el método de Kitamasa:
+    si x^n = r0 + r1*x + ... + r(k-1)*x^(k-1) mod P(x), entonces a(n) = sum(ri * a(i)).
+    """
+    k = len(coeficientes)
+    if n < k:
+        return iniciales[n] % m if m else iniciales[n]
+    if k == 2 and coeficientes[0] == coeficientes[1] == 1:
+        # Recurrencia de Fibonacci (Lucas, etc.): a(n) = a0*F(n-1) + a1*F(n)
+        f_anterior, f_actual = _fibonacci_doble(n - 1, m)
+        valor = iniciales[0] * f_anterior + iniciales[1] * f_actual
+        return valor % m if m else valor
+    residuo = _ReductorRecurrencia(coeficientes, m).potencia_x(n)
+    valor = sum(r * a for r, a in zip(residuo, iniciales))
+    return valor % m if m else valor
+
+
+def _iter_recurrencia(coeficientes, iniciales, n, m=0):
+    """
+    Genera los primeros n términos de la recurrencia, cada uno a partir de los k anteriores.
+    """
+    ventana = deque((a % m if m else a for a in iniciales), maxlen=len(iniciales))
+    yield from list(ventana)[:n]
+    for _ in range(n - len(ventana)):
+        siguiente = sum(c * a for c, a in zip(coeficientes, reversed(ventana)))
+        if m:
+            siguiente %= m
+        yield siguiente
+        ventana.append(siguiente)
+
+
+def _iter_filas_pascal(filas):
+    """
+    Genera las primeras filas del triángulo de Pascal, cada una a partir de la anterior.
+    """
+    fila = [1]
+    for _ in range(filas):
+        yield fila
+        fila = [1] + [fila[j - 1] + fila[j] for j in range(1, len(fila))] + [1]
+
+
+def _producto_balanceado(valores, lo, hi):
+    """
+    Producto de valores[lo:hi] con un árbol binario equilibrado, así las
+    multiplicaciones grandes se hacen entre operandos de tamaño parecido.
+    """
+    if hi - lo <= 8:
+        producto = 1
+        for i in range(lo, hi):
+            producto *= valores[i]
+        return producto
+    medio = (lo + hi) // 2
+    return _producto_balanceado(valores, lo, medio) * _producto_balanceado(valores, medio, hi)
+
+
+def _swing(n, primos):
+    """
+    Swing n≀ = n! / ((n//2)!)^2 factorizado a partir de los primos hasta n.
+    """
+    raiz = math.isqrt(n)
+    factores = []
+    for p in primos:
+        if p > n:
+            break
+        if p > raiz:
+            # p aparece a lo sumo una vez: exponente (n // p) mod 2
+            if (n // p) & 1:
+                factores.append(p)
+            continue
+        q, potencia = n, 1
+        while q:
+            q //= p
+            if q & 1:
+                potencia *= p
+        if potencia > 1:
+            factores.append(potencia)
+    return _producto_balanceado(factores, 0, len(factores))
+
+
+def _factorial_swing(n, primos):
+    """
+    Factorial por el algoritmo prime swing: n! = ((n//2)!)^2 * n≀.
+    """
+    if n < 20:
+        return math.prod(range(2, n + 1))
+    return _factorial_swing(n // 2, primos) ** 2 * _swing(n, primos)
+
+
+# Lado a partir del cual es_cuadrado_magico convierte las listas a NumPy
+_UMBRAL_CUADRADO_NUMPY = 16
+
+# Cantidad de enteros por bloque en los recorridos de la criba de σ
+_TAMANO_BLOQUE_SIGMA = 1 << 16
+
+
+def _sigma_bloque(lo, hi):
+    """
+    Criba de la suma de divisores σ(k) para los k del bloque [lo, hi).
+
+    Cada divisor d <= √k se empareja con su cofactor k // d, que avanza de uno
+    en uno sobre los múltiplos consecutivos de d, así que no hace falta dividir.
+
+    Args:
+        lo (int): Inicio del bloque (incluido, mayor o igual a 0)
+        hi (int): Fin del bloque (excluido)
+
+    Returns:
+        array: array('Q') donde la posición i guarda σ(lo + i) (σ(0) = 0)
+    """
+    tamano = max(hi - lo, 0)
+    sigma = array('Q', bytes(8 * tamano))
+    for d in range(1, math.isqrt(max(hi - 1, 0)) + 1):
+        # Menor cofactor q >= d con d * q dentro del bloque
+        q = max(d, -(-lo // d))
+        inicio = d * q - lo
+        if inicio >= tamano:
+            continue
+        for i, cofactor in zip(range(inicio, tamano, d), count(q)):
+            sigma[i] += d + cofactor
+        if q == d:
+            sigma[inicio] -= d  # d * d solo aporta el divisor d una vez
+    return sigma
+
+
+def _recorrer_sigma(n, tamano_bloque):
+    """
+    Recorre σ(k) para 1 <= k <= n bloque a bloque.
+
+    Yields:
+        tuple: (lo, sigma) con el inicio del bloque y su array de σ
+    """
+    for lo in range(1, n + 1, tamano_bloque):
+        yield lo, _sigma_bloque(lo, min(lo + tamano_bloque, n + 1))
+
+
+def _lucas_lehmer(p):
+    """
+    Prueba de Lucas-Lehmer: indica si el número de Mersenne 2^p - 1 es primo (p primo).
+    """
+    if p == 2:
+        return True
+    mersenne = (1 << p) - 1
+    s = 4
+    for _ in range(p - 2):
+        # s^2 - 2 (mod 2^p - 1); sumamos el módulo para no pasar a negativo
+        s = s * s + mersenne - 2
+        # Reducción rápida: 2^p = 1 (mod 2^p - 1)
+        s = (s & mersenne) + (s >> p)
+        while s >= mersenne:
+            s -= mersenne
+    return s == 0
+
+
+# Límite de la tabla de menor factor primo que usa factorizar por defecto, y
+# tope hasta el que factorizar_lote puede agrandarla
+_LIMITE_SPF = 1 << 20
+_LIMITE_SPF_LOTE = 1 << 24
+
+
+def _construir_spf(limite):
+    """
+    Tabla de menor factor primo hasta limite; un 0 indica que el índice es primo.
+
+    Los primos se recorren de mayor a menor, de modo que la última asignación
+    sobre cada compuesto es la de su menor factor primo.
+    """
+    spf = array('I', bytes(4 * (limite + 1)))
+    for p in reversed(_primos_base(math.isqrt(limite))):
+        spf[p * p::p] = array('I', [p]) * ((limite - p * p) // p + 1)
+    return spf
+
+
+def _pollard_brent(n):
+    """
+    Variante de Brent del método rho de Pollard: devuelve un divisor no trivial
+    de n, que debe ser compuesto e impar.
+    """
+    c = 1
+    while True:
+        y, r, q, g = 2, 1, 1, 1
+        m = 128
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:
+            # El producto acumulado perdió el factor: retrocedemos paso a paso
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+        c += 1
+
+
+# Códigos de array.array enteros, y los que no tienen signo
+_CODIGOS_ENTEROS = 'bBhHiIlLqQ'
+_CODIGOS_SIN_SIGNO = 'BHILQ'
+
+
+def _aplicar_por_elemento(nombre_ufunc, funcion, a, b, ampliar=False):
+    """
+    Aplica una operación elemento a elemento sobre dos secuencias de enteros.
+    Usa la ufunc de NumPy si alguna entrada es un ndarray o si ambas son
+    array.array de enteros (que se envuelven sin copiar con np.frombuffer); si
+    no, aplica funcion con map. Con array.array el resultado es otro array.array,
+    del tipo de la primera entrada (o el tipo común de ambas con NumPy) o, si
+    ampliar es True, de 64 bits ('Q' si ambas entradas son sin signo, 'q' si no).
+    Si los valores no caben en ese tipo se devuelve una lista.
+    """
+    if np is not None and (isinstance(a, np.ndarray) or isinstance(b, np.ndarray)):
+        return getattr(np, nombre_ufunc)(a, b)
+    if len(a) != len(b):
+        raise ValueError("Las secuencias deben tener la misma longitud")
+    if not isinstance(a, array):
+        return list(map(funcion, a, b))
+    
+    sin_signo = a.typecode in _CODIGOS_SIN_SIGNO and isinstance(b, array) and b.typecode in _CODIGOS_SIN_SIGNO
+    codigo = ('Q' if sin_signo else 'q') if ampliar else a.typecode
+    if (np is not None and isinstance(b, array) and a.typecode in _CODIGOS_ENTEROS
+            and b.typecode in _CODIGOS_ENTEROS):
+        x = np.frombuffer(a, dtype=a.typecode)
+        y = np.frombuffer(b, dtype=b.typecode)
+        if ampliar:
+            x, y = x.astype(codigo), y.astype(codigo)
+        # Mezclar 'Q' con un tipo con signo daría float64 en NumPy
+        if np.result_type(x, y).kind in 'iu':
+            valores = getattr(np, nombre_ufunc)(x, y)
+            # Un resultado negativo solo sale de |mínimo con signo|, que no cabe en el tipo
+            if ampliar or not (valores < 0).any():
+                resultado = array(valores.dtype.char)
+                resultado.frombytes(valores.tobytes())
+                return resultado
+    valores = list(map(funcion, a, b))
+    for tipo in (codigo, 'q'):
+        try:
+            return array(tipo, valores)
+        except OverflowError:
+            pass
+    return valores
+
+
+def _reducir_en_arbol(funcion, valores, absorbente):
+    """
+    Reduce valores por parejas, nivel a nivel, como un árbol equilibrado.
+    Se detiene en cuanto aparece el elemento absorbente de la operación.
+    """
+    while len(valores) > 1:
+        siguiente = []
+        for i in range(0, len(valores) - 1, 2):
+            valor = funcion(valores[i], valores[i + 1])
+            if valor == absorbente:
+                return absorbente
+            siguiente.append(valor)
+        if len(valores) % 2:
+            siguiente.append(valores[-1])
+        valores = siguiente
+    return valores[0]
+
+
+def _armstrong_de_longitud(d):
+    """
+    Busca los números de Armstrong de exactamente d cifras enumerando multiconjuntos
+    de dígitos (combinaciones con repetición) en lugar de recorrer cada entero.
+
+    Se eligen las cantidades de cada dígito de 9 a 0 acumulando la suma de potencias.
+    Una rama se poda si la suma ya no puede tener d cifras, o si el prefijo común de
+    la menor y la mayor suma alcanzables usa más veces un dígito ya fijado.
+    """
+    potencias = [i ** d for i in range(10)]
+    inferior = 10 ** (d - 1) if d > 1 else 0
+    superior = 10 ** d
+    conteos = [0] * 10
+    encontrados = []
+
+    def buscar(digito, restantes, suma):
+        if digito == 0:
+            # Los ceros restantes no cambian la suma: verificamos sus cifras
+            if inferior <= suma < superior:
+                conteos[0] = restantes
+                cifras = str(suma).zfill(d)
+                if all(cifras.count(str(i)) == conteos[i] for i in range(10)):
+                    encontrados.append(suma)
+            return
+        maximo = suma + restantes * potencias[digito]
+        if maximo < inferior or suma >= superior:
+            return
+        if suma >= inferior and maximo < superior:
+            menor, mayor = str(suma), str(maximo)
+            prefijo = 0
+            while prefijo < d and menor[prefijo] == mayor[prefijo]:
+                prefijo += 1
+            comun = menor[:prefijo]
+            for v in range(digito + 1, 10):
+                if comun.count(str(v)) > conteos[v]:
+                    return
+        for c in range(restantes, -1, -1):
+            conteos[digito] = c
+            buscar(digito - 1, restantes - c, suma + c * potencias[digito])
+        conteos[digito] = 0
+
+    buscar(9, d, 0)
+    return sorted(encontrados)
+
+
+# Suma de dígitos de cada bloque de 4 cifras (0..9999), para recorrer los enteros
+# en base 10^4 en lugar de cifra por cifra
+_SUMA_DIGITOS_BLOQUE = bytes(sum(map(int, str(i))) for i in range(10 ** 4))
+
+# Cantidad de cifras a partir de la cual suma_digitos parte el número en mitades
+_CIFRAS_PARTICION = 256
+
+# Potencias 10^k usadas al partir enteros grandes (k siempre es potencia de 2)
+_POTENCIAS_DIEZ = {}
+
+
+def _potencia_diez(k):
+    """
+    Devuelve 10^k guardándolo en caché.
+    """
+    potencia = _POTENCIAS_DIEZ.get(k)
+    if potencia is None:
+        potencia = _POTENCIAS_DIEZ[k] = 10 ** k
+    return potencia
+
+
+def _suma_digitos_particion(n, k):
+    """
+    Suma de dígitos de 0 <= n < 10^(2k) partiendo n en base 10^k de forma recursiva.
+    Cada división reparte el trabajo en dos mitades de tamaño parecido, en lugar de
+    las divisiones por 10 de toda la longitud del número.
+    """
+    if k <= _CIFRAS_PARTICION:
+        suma = 0
+        while n:
+            n, bloque = divmod(n, 10 ** 4)
+            suma += _SUMA_DIGITOS_BLOQUE[bloque]
+        return suma
+    alto, bajo = divmod(n, _potencia_diez(k))
+    return _suma_digitos_particion(alto, k // 2) + _suma_digitos_particion(bajo, k // 2)
+
+
+def _suma_digitos_acumulada(n):
+    """
+    Suma de suma_digitos(k) para 0 <= k <= n, recorriendo las cifras de n.
+    """
+    if n < 0:
+        return 0
+    cifras = str(n)
+    total = prefijo = 0
+    for i, cifra in enumerate(cifras):
+        d = int(cifra)
+        resto = len(cifras) - i - 1
+        p = 10 ** resto
+        # Números con el mismo prefijo, un dígito x < d aquí y el resto libre
+        total += d * prefijo * p + d * (d - 1) // 2 * p + d * resto * 45 * p // 10
+        prefijo += d
+    return total + prefijo
+
+
+def _contar_suma_digitos_acumulada(n, objetivo):
+    """
+    Cantidad de enteros 0 <= k <= n cuya suma de dígitos es objetivo.
+    """
+    if n < 0 or objetivo < 0:
+        return 0
+    cifras = str(n)
+    # formas[r][t]: cadenas de r dígitos cuya suma es t
+    formas = [[1] + [0] * objetivo]
+    for _ in range(len(cifras)):
+        anterior = formas[-1]
+        fila = [0] * (objetivo + 1)
+        for t in range(objetivo + 1):
+            fila[t] = sum(anterior[t - x] for x in range(min(9, t) + 1))
+        formas.append(fila)
+    
+    total = prefijo = 0
+    for i, cifra in enumerate(cifras):
+        d = int(cifra)
+        resto = len(cifras) - i - 1
+        for x in range(d):
+            falta = objetivo - prefijo - x
+            if falta < 0:
+                break
+            total += formas[resto][falta]
+        prefijo += d
+    return total + (prefijo == objetivo)
+
+
+def _sumar_en_rango(acumulada, a, b):
+    """
+    Suma f(|k|) para a <= k <= b a partir de acumulada(n) = f(0) + ... + f(n).
+    """
+    if a > b:
+        return 0
+    if a >= 0:
+        return acumulada(b) - acumulada(a - 1)
+    if b < 0:
+        return acumulada(-a) - acumulada(-b - 1)
+    return acumulada(b) + acumulada(-a) - acumulada(0)
+
+
+# Patrones 2x2 del método LUX de Conway para cuadrados de orden 4m + 2 (L, U, X)
+_PATRONES_LUX = (((4, 1), (2, 3)), ((1, 4), (2, 3)), ((1, 4), (3, 2)))
+
+# Cantidad aproximada de celdas que se calculan por bloque de filas con NumPy
+_CELDAS_POR_BLOQUE = 1 << 20
+
+
+def _validar_orden_cuadrado(n):
+    """
+    Verifica que exista un cuadrado mágico normal de orden n.
+    """
+    if n < 1 or n == 2:
+        raise ValueError("No existe un cuadrado mágico de ese orden")
+
+
+def _fila_cuadrado_magico(n, i):
+    """
+    Calcula la fila i del cuadrado mágico de orden n con fórmulas cerradas:
+    método siamés (n impar), complemento en diagonales (n múltiplo de 4)
+    y método LUX (n = 4m + 2).
+    """
+    if n % 2 == 1:
+        # Siamés: se parte del centro de la fila superior avanzando en diagonal
+        c = n // 2 + 1
+        return [n * ((i + j + c) % n) + (i + 2 * j + 1) % n + 1 for j in range(n)]
+    if n % 4 == 0:
+        # Se complementan las celdas de las diagonales de cada bloque 4x4
+        fila = []
+        for j in range(n):
+            valor = i * n + j + 1
+            if i % 4 == j % 4 or i % 4 + j % 4 == 3:
+                valor = n * n + 1 - valor
+            fila.append(valor)
+        return fila
+    # LUX: cuadrado siamés de orden k = 2m + 1 donde cada celda es un bloque 2x2
+    k, m = n // 2, (n - 2) // 4
+    bi, sub = divmod(i, 2)
+    fila = []
+    for bj in range(k):
+        base = 4 * (k * ((bi + bj + k // 2 + 1) % k) + (bi + 2 * bj + 1) % k)
+        letra = 0 if bi <= m else (1 if bi == m + 1 else 2)
+        if bj == m and bi in (m, m + 1):
+            letra = 1 - letra  # Se intercambia la U central con la L de encima
+        a, b = _PATRONES_LUX[letra][sub]
+        fila.append(base + a)
+        fila.append(base + b)
+    return fila
+
+
+def _bloque_cuadrado_magico(n, i, j):
+    """
+    Versión vectorizada de _fila_cuadrado_magico: i es una columna y j una fila
+    de índices (ndarray de int64) y devuelve la submatriz correspondiente.
+    """
+    if n % 2 == 1:
+        return n * ((i + j + n // 2 + 1) % n) + (i + 2 * j + 1) % n + 1
+    if n % 4 == 0:
+        valor = i * n + j + 1
+        diagonal = (i % 4 == j % 4) | (i % 4 + j % 4 == 3)
+        return np.where(diagonal, n * n + 1 - valor, valor)
+    k, m = n // 2, (n - 2) // 4
+    bi, bj = i // 2, j // 2
+    base = 4 * (k * ((bi + bj + k // 2 + 1) % k) + (bi + 2 * bj + 1) % k)
+    letra = np.where(bi <= m, 0, np.where(bi == m + 1, 1, 2))
+    letra = np.where((bj == m) & ((bi == m) | (bi == m + 1)), 1 - letra, letra)
+    return base + np.array(_PATRONES_LUX)[letra, i % 2, j % 2]
+
+
+class TokenCancelacion:
+    """
+    Señal de cancelación compartida entre procesos, con tiempo límite opcional.
+    Las búsquedas largas la consultan periódicamente y se detienen al activarse.
+    """
+    
+    def __init__(self, tiempo_limite=None):
+        """
+        Args:
+            tiempo_limite (float): Segundos desde la creación tras los que se considera cancelado
+        """
+        self._evento = multiprocessing.Event()
+        self._vence = None if tiempo_limite is None else time.monotonic() + tiempo_limite
+    
+    def cancelar(self):
+        """
+        Activa la cancelación.
+        """
+        self._evento.set()
+    
+    def cancelado(self):
+        """
+        Returns:
+            bool: True si se pidió cancelar o se venció el tiempo límite
+        """
+        if self._evento.is_set():
+            return True
+        return self._vence is not None and time.monotonic() >= self._vence
+
+
+# Token de cancelación de cada proceso trabajador de la búsqueda de cuadrados
+_TOKEN_TRABAJADOR = None
+
+
+def _inicializar_trabajador(token):
+    """
+    Guarda el token de cancelación en el proceso trabajador.
+    """
+    global _TOKEN_TRABAJADOR
+    _TOKEN_TRABAJADOR = token
+
+
+def _orden_cuadrado(n, fijas):
+    """
+    Decide el orden en que la búsqueda llena las celdas de un cuadrado de orden n.
+
+    Primero van las celdas fijas. Después, cada vez que una fila, columna o diagonal
+    queda con una sola celda libre, esa celda pasa a ser forzada por la línea. Si no
+    hay ninguna, se elige la celda libre que, al llenarse, fuerza más celdas.
+
+    Returns:
+        tuple: (orden, lineas_de, forzadas) con la lista de posiciones, las líneas de
+               cada posición y {posición: línea que la determina}
+    """
+    total = n * n
+    # Líneas: filas 0..n-1, columnas n..2n-1, diagonal 2n y antidiagonal 2n+1
+    lineas_de = []
+    for pos in range(total):
+        r, c = divmod(pos, n)
+        lineas = [r, n + c]
+        if r == c:
+            lineas.append(2 * n)
+        if r + c == n - 1:
+            lineas.append(2 * n + 1)
+        lineas_de.append(tuple(lineas))
+    celdas_de = [[] for _ in range(2 * n + 2)]
+    for pos in range(total):
+        for linea in lineas_de[pos]:
+            celdas_de[linea].append(pos)
+
+    def propagar(llenas):
+        # Llena las celdas forzadas hasta que ninguna línea tenga una sola libre
+        forzadas = []
+        cambio = True
+        while cambio:
+            cambio = False
+            for linea, celdas in enumerate(celdas_de):
+                pendientes = [pos for pos in celdas if pos not in llenas]
+                if len(pendientes) == 1:
+                    llenas.add(pendientes[0])
+                    forzadas.append((pendientes[0], linea))
+                    cambio = True
+        return forzadas
+
+    orden, forzadas, llenas = sorted(fijas), {}, set(fijas)
+    while True:
+        for pos, linea in propagar(llenas):
+            orden.append(pos)
+            forzadas[pos] = linea
+        libres = [pos for pos in range(total) if pos not in llenas]
+        if not libres:
+            return orden, lineas_de, forzadas
+        # Elegimos la celda libre que más celdas fuerza al llenarse
+        elegida = max(libres, key=lambda pos: (len(propagar(llenas | {pos})), -pos))
+        orden.append(elegida)
+        llenas.add(elegida)
+
+
+def _explorar_cuadrados(n, fijas, prefijo, limite, solo_contar, tokens, profundidad=None):
+    """
+    Búsqueda con retroceso de cuadrados mágicos de orden n.
+
+    Los números usados se llevan en una máscara de bits y cada candidato se acota
+    con las sumas parciales de su fila, su columna y sus diagonales: la suma que
+    falta debe poder completarse con las celdas libres de la línea. Las celdas que
+    cierran una línea quedan determinadas por la constante mágica.
+
+    Args:
+        n (int): Orden del cuadrado
+        fijas (dict): Celdas fijas {posición: valor}, con posición = fila * n + columna
+        prefijo (tuple): Valores ya elegidos para las primeras celdas del orden de búsqueda
+        limite (int): Cantidad de cuadrados tras la que se detiene (None sin límite)
+        solo_contar (bool): Si es True no se guardan los cuadrados
+        tokens (tuple): Tokens de cancelación consultados cada 4096 nodos
+        profundidad (int): Si se indica, devuelve los prefijos válidos de esa longitud
+
+    Returns:
+        dict: cuadrados, cantidad, nodos, completa y prefijos (si se pidió profundidad)
+    """
+    total = n * n
+    constante = n * (total + 1) // 2
+    # Menor y mayor suma posible de k números distintos entre 1 y n²
+    minimo = [k * (k + 1) // 2 for k in range(n + 1)]
+    maximo = [k * total - k * (k - 1) // 2 for k in range(n + 1)]
+    reservados = 0
+    for valor in fijas.values():
+        reservados |= 1 << valor
+    orden, lineas_de, forzadas = _orden_cuadrado(n, fijas)
+
+    celdas = [0] * total
+    sumas = [0] * (2 * n + 2)
+    libres = [n] * (2 * n + 2)
+    estado = {"usados": 0, "nodos": 0, "cantidad": 0, "detenido": False}
+    cuadrados = []
+    prefijos = []
+
+    def poner(pos, v, signo):
+        celdas[pos] = v if signo > 0 else 0
+        for linea in lineas_de[pos]:
+            sumas[linea] += signo * v
+            libres[linea] -= signo
+        estado["usados"] ^= 1 << v
+
+    def colocar(k):
+        if k == profundidad:
+            prefijos.append(tuple(celdas[pos] for pos in orden[:k]))
+            return
+        if k == total:
+            estado["cantidad"] += 1
+            if not solo_contar:
+                cuadrados.append([celdas[i * n:(i + 1) * n] for i in range(n)])
+            if limite is not None and estado["cantidad"] >= limite:
+                estado["detenido"] = True
+            return
+        estado["nodos"] += 1
+        if estado["nodos"] & 0xFFF == 1 and any(token.cancelado() for token in tokens):
+            estado["detenido"] = True
+            return
+
+        pos = orden[k]
+        lineas = lineas_de[pos]
+        if pos in fijas:
+            candidatos = (fijas[pos],)
+        elif pos in forzadas:
+            candidatos = (constante - sumas[forzadas[pos]],)
+        else:
+            candidatos = None
+        # Rango de valores con el que todas las líneas de la celda pueden completarse
+        bajo, alto = 1, total
+        for linea in lineas:
+            resto = libres[linea] - 1
+            bajo = max(bajo, constante - sumas[linea] - maximo[resto])
+            alto = min(alto, constante - sumas[linea] - minimo[resto])
+        if candidatos is None:
+            candidatos = range(bajo, alto + 1)
+
+        ocupados = estado["usados"] | (0 if pos in fijas else reservados)
+        for v in candidatos:
+            if v < bajo or v > alto or ocupados >> v & 1:
+                continue
+            poner(pos, v, 1)
+            colocar(k + 1)
+            poner(pos, v, -1)
+            if estado["detenido"]:
+                return
+
+    for pos, v in zip(orden, prefijo):
+        poner(pos, v, 1)
+    colocar(len(prefijo))
+    return {
+        "cuadrados": cuadrados,
+        "cantidad": estado["cantidad"],
+        "nodos": estado["nodos"],
+        "completa": not estado["detenido"] or estado["cantidad"] == limite,
+        "prefijos": prefijos
+    }
+
+
+# Unidades de trabajo que se buscan por proceso al repartir la búsqueda de cuadrados
+_UNIDADES_POR_PROCESO = 4
+
+
+def _dividir_busqueda(n, fijas, unidades):
+    """
+    Reparte la búsqueda en prefijos del orden de búsqueda. Las celdas fijas van
+    primero en ese orden y no ramifican, así que se empieza por las dos primeras
+    celdas libres y se profundiza hasta tener al menos `unidades` prefijos.
+
+    Returns:
+        dict: Resultado de _explorar_cuadrados con los prefijos y los nodos recorridos
+    """
+    total = n * n
+    profundidad = min(len(fijas) + 2, total)
+    division = _explorar_cuadrados(n, fijas, (), None, True, (), profundidad=profundidad)
+    while 0 < len(division["prefijos"]) < unidades and profundidad < total:
+        profundidad += 1
+        division = _explorar_cuadrados(n, fijas, (), None, True, (), profundidad=profundidad)
+    return division
+
+
+def _tarea_cuadrados(n, fijas, prefijo, limite, solo_contar):
+    """
+    Explora el subárbol de un prefijo dentro de un proceso trabajador.
+    """
+    return _explorar_cuadrados(n, fijas, prefijo, limite, solo_contar, (_TOKEN_TRABAJADOR,))
+
+
+def _contar_primos_lucy(x):
+    """
+    Función π(x) por el método de Lucy_Hedgehog en O(x^(3/4)) operaciones y O(√x) memoria.
+
+    Mantiene S(v) = cantidad de enteros en [2, v] que sobreviven a la criba para
+    los valores v = x // i, separados en pequenos[v] (v <= √x) y grandes[i]
+    (v = x // i). Por cada primo p <= √x (tomado de la criba) se actualiza
+    S(v) -= S(v // p) - S(p - 1) para todo v >= p². Con NumPy cada primo es una
+    sola operación vectorizada sobre los arreglos.
+    """
+    r = math.isqrt(x)
+    primos = _primos_base(r)
+    if np is not None and x < 1 << 62:
+        pequenos = np.arange(-1, r, dtype=np.int64)
+        grandes = np.zeros(r + 1, dtype=np.int64)
+        grandes[1:] = x // np.arange(1, r + 1, dtype=np.int64) - 1
+        for p in primos:
+            sp = int(pequenos[p - 1])
+            p2 = p * p
+            limite_i = min(r, x // p2)
+            k = min(limite_i, r // p)
+            # x // (i * p) sigue en grandes mientras i * p <= √x; si no, en pequenos
+            grandes[1:k + 1] -= grandes[p:p * k + 1:p] - sp
+            if limite_i > k:
+                indices = x // (np.arange(k + 1, limite_i + 1, dtype=np.int64) * p)
+                grandes[k + 1:limite_i + 1] -= pequenos[indices] - sp
+            if p2 <= r:
+                pequenos[p2:] -= pequenos[np.arange(p2, r + 1, dtype=np.int64) // p] - sp
+        return int(grandes[1])
+
+    pequenos = list(range(-1, r))
+    grandes = [0] + [x // i - 1 for i in range(1, r + 1)]
+    for p in primos:
+        sp = pequenos[p - 1]
+        p2 = p * p
+        limite_i = min(r, x // p2)
+        k = min(limite_i, r // p)
+        for i in range(1, k + 1):
+            grandes[i] -= grandes[i * p] - sp
+        for i in range(k + 1, limite_i + 1):
+            grandes[i] -= pequenos[x // (i * p)] - sp
+        # De mayor a menor para leer S(v // p) antes de actualizarlo
+        for v in range(r, p2 - 1, -1):
+            pequenos[v] -= pequenos[v // p] - sp
+    return grandes[1]
+
+
+# Tablas para pasar de un byte por impar (0 o 1) a un bit por impar y viceversa
+_TABLAS_EMPAQUETAR = [bytes((1 << k) if b else 0 for b in range(256)) for k in range(8)]
+_TABLAS_DESEMPAQUETAR = [bytes((b >> k) & 1 for b in range(256)) for k in range(8)]
+
+
+def _empaquetar_bits(segmento):
+    """
+    Empaqueta un segmento de la criba (un byte 0/1 por impar) en un bit por impar,
+    con el bit k de cada byte representando la entrada 8j + k.
+    """
+    if len(segmento) % 8:
+        segmento = bytes(segmento) + bytes(8 - len(segmento) % 8)
+    empaquetado = 0
+    for k in range(8):
+        # Cada columna k aporta un bit distinto, así que el OR de enteros no lleva acarreo
+        columna = bytes(segmento[k::8]).translate(_TABLAS_EMPAQUETAR[k])
+        empaquetado |= int.from_bytes(columna, 'little')
+    return empaquetado.to_bytes(len(segmento) // 8, 'little')
+
+
+def _desempaquetar_bits(datos):
+    """
+    Operación inversa de _empaquetar_bits: un byte 0/1 por cada bit de datos.
+    """
+    salida = bytearray(8 * len(datos))
+    for k in range(8):
+        salida[k::8] = datos.translate(_TABLAS_DESEMPAQUETAR[k])
+    return salida
+
+
+# Impares que criba cada tarea del modo paralelo (2 MiB de bits empaquetados)
+_TAMANO_FRAGMENTO = 1 << 24
+# Primos base leídos de la memoria compartida por cada proceso trabajador
+_BASE_TRABAJADOR = None
+
+
+def _inicializar_criba(nombre, cantidad):
+    """
+    Copia una sola vez los primos base desde la memoria compartida al trabajador.
+    """
+    global _BASE_TRABAJADOR
+    memoria = shared_memory.SharedMemory(name=nombre)
+    try:
+        _BASE_TRABAJADOR = array('Q')
+        _BASE_TRABAJADOR.frombytes(memoria.buf[:8 * cantidad])
+    finally:
+        memoria.close()
+
+
+def _tarea_criba(inicio, fin):
+    """
+    Criba los impares de [inicio, fin) en un trabajador y devuelve sus bits empaquetados.
+    """
+    return b''.join(_empaquetar_bits(segmento)
+                    for _, segmento in _segmentos_criba(inicio, fin, base=_BASE_TRABAJADOR))
+
+
+def _iter_primos_paralelo(lo, hi, procesos):
+    """
+    Criba [lo, hi) repartiendo fragmentos entre procesos y genera los primos en orden.
+
+    Los primos base se publican una vez en memoria compartida y cada fragmento
+    vuelve como un bitset (un bit por impar) en lugar de una lista de enteros.
+    Solo se mantienen en curso unos pocos fragmentos por proceso, así la memoria
+    queda acotada aunque el consumidor sea más lento que la criba.
+    """
+    lo = max(lo, 2)
+    if hi <= lo:
+        return
+    if lo == 2:
+        yield 2
+        lo = 3
+    if lo % 2 == 0:
+        lo += 1
+    if hi <= lo:
+        return
+    base = array('Q', _primos_base(math.isqrt(hi - 1))[1:])
+    memoria = shared_memory.SharedMemory(create=True, size=max(len(base) * 8, 1))
+    try:
+        memoria.buf[:len(base) * 8] = base.tobytes()
+        with ProcessPoolExecutor(procesos, initializer=_inicializar_criba,
+                                 initargs=(memoria.name, len(base))) as ejecutor:
+            en_curso = deque()
+
+            def primos_de(fragmento):
+                inicio, fin, futuro = fragmento
+                return compress(range(inicio, fin, 2), _desempaquetar_bits(futuro.result()))
+
+            try:
+                for inicio in range(lo, hi, 2 * _TAMANO_FRAGMENTO):
+                    fin = min(inicio + 2 * _TAMANO_FRAGMENTO, hi)
+                    en_curso.append((inicio, fin, ejecutor.submit(_tarea_criba, inicio, fin)))
+                    if len(en_curso) == 2 * procesos:
+                        yield from primos_de(en_curso.popleft())
+                while en_curso:
+                    yield from primos_de(en_curso.popleft())
+            finally:
+                # Si el consumidor abandona el generador no se criban los fragmentos pendientes
+                for _, _, futuro in en_curso:
+                    futuro.cancel()
+    finally:
+        memoria.close()
+        memoria.unlink()
+
+
 class Magic:
     """
     Clase con métodos para juegos matemáticos, secuencias especiales y algoritmos numéricos.
     Incluye implementaciones de Fibonacci, números perfectos, triangulo de pascal etc.
     """
     
+    def __init__(self):
+        # Tabla de menor factor primo compartida por factorizar y factorizar_lote
+        self._spf = None
+        # Valores de π(x) ya calculados, por contar_primos o tabla_pi
+        self._tabla_pi = {}
+        self._tabla_aritmetica = None
+    
     def fibonacci(self, n):
         """
         Calcula el n-ésimo número de la secuencia de Fibonacci.
+        Es el caso particular de termino_recurrencia que usa duplicación rápida,
+        con O(log n) operaciones.
         
         Args:
             n (int): Posición en la secuencia (empezando desde 0)
@@ -16,77 +1239,329 @@ class Magic:
         """
         if n < 0:
             return 0
-        if n == 0:
-            return 0
-        if n == 1 or n == 2:
-            return 1
+        return self.termino_recurrencia((1, 1), (0, 1), n)
+    
+    def fibonacci_mod(self, n, m):
+        """
+        Calcula el n-ésimo número de Fibonacci módulo m sin construir enteros grandes.
         
-        # Usamos un enfoque iterativo para calcular el n-ésimo número
-        a, b = 0, 1
-        for _ in range(2, n + 1):
-            a, b = b, a + b
-        return b
+        Args:
+            n (int): Posición en la secuencia (empezando desde 0)
+            m (int): Módulo (mayor que 0)
+            
+        Returns:
+            int: F(n) mod m
+        """
+        if m <= 0:
+            raise ValueError("El módulo debe ser positivo")
+        if n < 0:
+            return 0
+        return self.termino_recurrencia((1, 1), (0, 1), n, m)
     
-    def secuencia_fibonacci(self, n):
+    def secuencia_fibonacci(self, n, perezosa=False):
         """
         Genera los primeros n números de la secuencia de Fibonacci.
         
         Args:
             n (int): Cantidad de números a generar
+            perezosa (bool): Si es True devuelve un generador en lugar de una lista
             
         Returns:
-            list: Lista con los primeros n números de Fibonacci
+            list: Lista con los primeros n números de Fibonacci (o un generador si perezosa es True)
         """
-        if n <= 0:
-            return []
+        # Generamos la secuencia en una sola pasada incremental
+        secuencia = _iter_fibonacci(max(n, 0))
+        if perezosa:
+            return secuencia
+        return list(secuencia)
+    
+    def termino_recurrencia(self, coeficientes, iniciales, n, modulo=None):
+        """
+        Calcula el término n de la recurrencia lineal
+        a(i) = c1*a(i-1) + c2*a(i-2) + ... + ck*a(i-k) con el método de Kitamasa,
+        en O(k^2 log n) operaciones (o O(M(k) log n) con módulo y k grande).
+        La recurrencia de Fibonacci (1, 1) usa duplicación rápida.
         
-        # Generamos la secuencia usando el método fibonacci
-        secuencia = []
-        for i in range(n):
-            secuencia.append(self.fibonacci(i))
-        return secuencia
+        Args:
+            coeficientes (list): Coeficientes c1, ..., ck
+            iniciales (list): Términos a(0), ..., a(k-1)
+            n (int): Índice del término (empezando desde 0)
+            modulo (int, optional): Si se indica, el resultado se reduce módulo este valor
+            
+        Returns:
+            int: El término a(n), o a(n) mod modulo
+        """
+        coeficientes, iniciales = _validar_recurrencia(coeficientes, iniciales, modulo)
+        if n < 0:
+            raise ValueError("El índice debe ser mayor o igual a 0")
+        if modulo == 1:
+            return 0
+        return _termino_recurrencia(coeficientes, iniciales, n, modulo or 0)
+    
+    def secuencia_recurrencia(self, coeficientes, iniciales, n, modulo=None, perezosa=False):
+        """
+        Genera los primeros n términos de una recurrencia lineal.
+        
+        Args:
+            coeficientes (list): Coeficientes c1, ..., ck
+            iniciales (list): Términos a(0), ..., a(k-1)
+            n (int): Cantidad de términos a generar
+            modulo (int, optional): Si se indica, los términos se reducen módulo este valor
+            perezosa (bool): Si es True devuelve un generador en lugar de una lista
+            
+        Returns:
+            list: Lista con los primeros n términos (o un generador si perezosa es True)
+        """
+        coeficientes, iniciales = _validar_recurrencia(coeficientes, iniciales, modulo)
+        secuencia = _iter_recurrencia(coeficientes, iniciales, max(n, 0), modulo or 0)
+        if perezosa:
+            return secuencia
+        return list(secuencia)
     
     def es_primo(self, n):
         """
         Verifica si un número es primo.
+        Para n < 2^64 usa Miller-Rabin determinista; para valores mayores usa BPSW.
         
         Args:
-            n (int): Número a verificar
+            n (int): Número a verificar (se aceptan floats con valor entero, como 7.0)
             
         Returns:
             bool: True si n es primo, False en caso contrario
         """
-        if n <= 1 or n < 0:  # Números menores o iguales a 1 y negativos no son primos
+        if n <= 1:  # Números menores o iguales a 1 y negativos no son primos
+            return False
+        if not isinstance(n, int):
+            # Normalizamos antes de elegir método, así el resultado no depende del tamaño
+            if isinstance(n, float) and n.is_integer():
+                n = int(n)
+            else:
+                n = operator.index(n)
+        if n <= _MAYOR_PRIMO_PEQUENO:
+            return n in _PRIMOS_PEQUENOS
+        # División previa por los primos pequeños
+        if math.gcd(n, _PRODUCTO_PRIMOS_PEQUENOS) != 1:
             return False
+        if n < _MAYOR_PRIMO_PEQUENO * _MAYOR_PRIMO_PEQUENO:
+            return True
         
-        # Verificamos divisibilidad hasta la raíz cuadrada de n
-        for i in range(2, int(n ** 0.5) + 1):
-            if n % i == 0:
-                return False
-        return True
+        # Escribimos n - 1 = d * 2^s con d impar
+        d, s = n - 1, 0
+        while d % 2 == 0:
+            d //= 2
+            s += 1
+        if n < 1 << 64:
+            return all(_miller_rabin(n, a, d, s) for a in _TESTIGOS_64)
+        return _miller_rabin(n, 2, d, s) and _lucas_fuerte(n)
     
-    def generar_primos(self, n):
+    def es_primo_lote(self, numeros):
+        """
+        Verifica la primalidad de muchos números a la vez.
+        Si los valores son densos se resuelven con una sola criba; si no, uno a uno.
+        
+        Args:
+            numeros (iterable): Números a verificar
+            
+        Returns:
+            list: Lista de bool con el resultado para cada número, en el mismo orden
+        """
+        numeros = list(numeros)
+        if not numeros:
+            return []
+        mayor = max(numeros)
+        if mayor < 2:
+            return [False] * len(numeros)
+        if mayor > min(_LIMITE_CRIBA_LOTE, 256 * len(numeros)):
+            return [self.es_primo(n) for n in numeros]
+        
+        # Criba completa hasta el mayor valor del lote
+        criba = bytearray([1]) * (mayor + 1)
+        criba[:2] = bytes(2)
+        for p in _primos_base(math.isqrt(mayor)):
+            criba[p * p::p] = bytes((mayor - p * p) // p + 1)
+        return [n > 1 and criba[n] == 1 for n in numeros]
+    
+    def iter_primos(self, lo, hi, procesos=1):
+        """
+        Genera perezosamente los números primos en el intervalo [lo, hi).
+        Usa una criba segmentada, por lo que la memoria se mantiene acotada
+        sin importar qué tan grande sea hi. Con varios procesos, cada uno criba
+        fragmentos distintos del intervalo y los primos se entregan en orden.
+        
+        Args:
+            lo (int): Inicio del intervalo (incluido)
+            hi (int): Fin del intervalo (excluido)
+            procesos (int): Procesos trabajadores (None usa todos los núcleos, 1 no crea procesos)
+            
+        Returns:
+            generator: Generador de los primos del intervalo en orden creciente
+        """
+        if procesos is None:
+            procesos = os.cpu_count() or 1
+        if procesos <= 1 or hi - lo <= 2 * _TAMANO_FRAGMENTO:
+            return _iter_primos_segmentado(lo, hi)
+        return _iter_primos_paralelo(lo, hi, procesos)
+    
+    def generar_primos(self, n, compacto=False, procesos=1):
         """
         Genera una lista de números primos hasta n.
         
         Args:
             n (int): Límite superior para generar primos
+            compacto (bool): Si es True devuelve un array('Q') en lugar de una lista
+            procesos (int): Procesos trabajadores (None usa todos los núcleos, 1 no crea procesos)
             
         Returns:
-            list: Lista de números primos hasta n
+            list: Lista de números primos hasta n (o array('Q') si compacto es True)
         """
-        if n < 2:
-            return []
+        primos = self.iter_primos(2, n + 1, procesos)
+        if compacto:
+            return array('Q', primos)
+        return list(primos)
+    
+    def _tabla_spf(self, limite):
+        """
+        Devuelve la tabla de menor factor primo en caché, agrandándola si no llega a limite.
+        """
+        if self._spf is None or len(self._spf) <= limite:
+            self._spf = _construir_spf(limite)
+        return self._spf
+    
+    def tabla_aritmetica(self, limite, ruta=None):
+        """
+        Devuelve las tablas de menor factor primo, φ, μ y σ0 hasta limite, en caché.
+        Su tabla de menor factor primo pasa a usarse también en factorizar.
+        
+        Args:
+            limite (int): Mayor número que deben cubrir las tablas
+            ruta (str, optional): Archivo donde se leen las tablas si ya cubren
+                limite, o donde se guardan tras construirlas
+            
+        Returns:
+            TablaAritmetica: Las tablas, con consultas en O(1)
+        """
+        tabla = self._tabla_aritmetica
+        if tabla is None or tabla.limite < limite:
+            tabla = None
+            if ruta is not None and os.path.exists(ruta):
+                tabla = TablaAritmetica.cargar(ruta)
+                if tabla.limite < limite:
+                    tabla = None
+            if tabla is None:
+                tabla = TablaAritmetica(limite)
+                if ruta is not None:
+                    tabla.guardar(ruta)
+            self._tabla_aritmetica = tabla
+            if self._spf is None or len(self._spf) < len(tabla._spf):
+                self._spf = tabla._spf
+        return tabla
+    
+    def factorizar(self, n):
+        """
+        Descompone un número en factores primos.
+        Los valores pequeños se resuelven con la tabla de menor factor primo y
+        los grandes con Pollard-Brent rho y la prueba de primalidad.
+        
+        Args:
+            n (int): Número a factorizar (mayor que 0)
+            
+        Returns:
+            dict: Diccionario {primo: exponente} ordenado por primo
+        """
+        if n <= 0:
+            raise ValueError("Solo se pueden factorizar números positivos")
+        spf = self._tabla_spf(_LIMITE_SPF)
         
-        primos = []
-        for num in range(2, n + 1):
-            if self.es_primo(num):
-                primos.append(num)
-        return primos
+        factores = {}
+        pendientes = [n]
+        while pendientes:
+            m = pendientes.pop()
+            if m < len(spf):
+                # Recorremos la cadena de menores factores primos
+                while m > 1:
+                    p = spf[m] or m
+                    factores[p] = factores.get(p, 0) + 1
+                    m //= p
+                continue
+            if m % 2 == 0:
+                e = (m & -m).bit_length() - 1
+                factores[2] = factores.get(2, 0) + e
+                pendientes.append(m >> e)
+            elif self.es_primo(m):
+                factores[m] = factores.get(m, 0) + 1
+            else:
+                d = _pollard_brent(m)
+                pendientes.append(d)
+                pendientes.append(m // d)
+        return dict(sorted(factores.items()))
+    
+    def factorizar_lote(self, numeros):
+        """
+        Factoriza muchos números reutilizando una sola tabla de menor factor primo.
+        
+        Args:
+            numeros (iterable): Números a factorizar (mayores que 0)
+            
+        Returns:
+            list: Lista de diccionarios {primo: exponente}, en el mismo orden
+        """
+        numeros = list(numeros)
+        if numeros:
+            self._tabla_spf(min(max(max(numeros), _LIMITE_SPF), _LIMITE_SPF_LOTE))
+        return [self.factorizar(n) for n in numeros]
+    
+    def contar_primos(self, x):
+        """
+        Cuenta los números primos menores o iguales a x sin generarlos.
+        Usa el método de Lucy_Hedgehog y guarda el resultado en la tabla de π.
+        
+        Args:
+            x (int): Límite superior (incluido)
+            
+        Returns:
+            int: π(x), la cantidad de primos hasta x
+        """
+        if x < 2:
+            return 0
+        pi = self._tabla_pi.get(x)
+        if pi is None:
+            pi = self._tabla_pi[x] = _contar_primos_lucy(x)
+        return pi
+    
+    def tabla_pi(self, limite, paso):
+        """
+        Calcula π en los puntos de control paso, 2*paso, ..., hasta limite.
+        Hace una sola pasada de la criba segmentada y guarda cada punto en la tabla de π.
+        
+        Args:
+            limite (int): Último valor a considerar (incluido)
+            paso (int): Distancia entre puntos de control
+            
+        Returns:
+            dict: Diccionario {punto: π(punto)}
+        """
+        if paso <= 0:
+            raise ValueError("El paso debe ser positivo")
+        tabla = {}
+        puntos = range(paso, limite + 1, paso)
+        if not puntos:
+            return tabla
+        cuenta = 0
+        punto = paso
+        for primo in self.iter_primos(2, puntos[-1] + 1):
+            # Cerramos los puntos de control que quedan antes de este primo
+            while primo > punto:
+                tabla[punto] = self._tabla_pi[punto] = cuenta
+                punto += paso
+            cuenta += 1
+        for punto in range(punto, puntos[-1] + 1, paso):
+            tabla[punto] = self._tabla_pi[punto] = cuenta
+        return tabla
     
     def es_numero_perfecto(self, n):
         """
         Verifica si un número es perfecto (igual a la suma de sus divisores propios).
+        Los pares se reconocen por la forma 2^(p-1) * (2^p - 1) con 2^p - 1 primo.
         
         Args:
             n (int): Número a verificar
@@ -97,12 +1572,107 @@ class Magic:
         if n <= 0:
             return False
         
-        suma_divisores = 0
-        for i in range(1, n):
-            if n % i == 0:
-                suma_divisores += i
+        if n % 2 == 0:
+            # Teorema de Euclides-Euler: todo perfecto par es 2^(p-1) * (2^p - 1)
+            k = (n & -n).bit_length() - 1
+            p = k + 1
+            return n >> k == (1 << p) - 1 and self.es_primo(p) and _lucas_lehmer(p)
+        
+        # Impares: σ(n) a partir de la factorización
+        suma_divisores = 1
+        for p, e in self.factorizar(n).items():
+            suma_divisores *= (p ** (e + 1) - 1) // (p - 1)
+        
+        return suma_divisores - n == n
+    
+    def numeros_perfectos(self, cantidad=None):
+        """
+        Genera los números perfectos pares en orden creciente.
+        Recorre los exponentes primos p y aplica Lucas-Lehmer a 2^p - 1.
+        
+        Args:
+            cantidad (int): Cantidad de números a generar (None para no detenerse)
+            
+        Yields:
+            int: Los números perfectos 2^(p-1) * (2^p - 1)
+        """
+        generados = 0
+        lo, hi = 2, 1024
+        while cantidad is None or generados < cantidad:
+            for p in self.iter_primos(lo, hi):
+                if _lucas_lehmer(p):
+                    yield (1 << (p - 1)) * ((1 << p) - 1)
+                    generados += 1
+                    if generados == cantidad:
+                        return
+            lo, hi = hi, 2 * hi
+    
+    def criba_sigma(self, n):
+        """
+        Calcula la suma de divisores σ(k) de todos los k desde 0 hasta n.
+        
+        Args:
+            n (int): Límite superior (incluido)
+            
+        Returns:
+            array: array('Q') donde la posición k guarda σ(k)
+        """
+        return _sigma_bloque(0, max(n + 1, 0))
+    
+    def perfectos_hasta(self, n, tamano_bloque=_TAMANO_BLOQUE_SIGMA):
+        """
+        Busca los números perfectos (σ(k) = 2k) hasta n por bloques.
+        
+        Args:
+            n (int): Límite superior (incluido)
+            tamano_bloque (int): Cantidad de enteros revisados por bloque
+            
+        Yields:
+            list: Los números perfectos encontrados en cada bloque que tenga alguno
+        """
+        for lo, sigma in _recorrer_sigma(n, tamano_bloque):
+            encontrados = [lo + i for i, s in enumerate(sigma) if s == 2 * (lo + i)]
+            if encontrados:
+                yield encontrados
+    
+    def abundantes_hasta(self, n, tamano_bloque=_TAMANO_BLOQUE_SIGMA):
+        """
+        Busca los números abundantes (σ(k) > 2k) hasta n por bloques.
+        
+        Args:
+            n (int): Límite superior (incluido)
+            tamano_bloque (int): Cantidad de enteros revisados por bloque
+            
+        Yields:
+            list: Los números abundantes encontrados en cada bloque que tenga alguno
+        """
+        for lo, sigma in _recorrer_sigma(n, tamano_bloque):
+            encontrados = [lo + i for i, s in enumerate(sigma) if s > 2 * (lo + i)]
+            if encontrados:
+                yield encontrados
+    
+    def amigos_hasta(self, n, tamano_bloque=_TAMANO_BLOQUE_SIGMA):
+        """
+        Busca los pares de números amigos (a, b) con a < b <= n.
         
-        return suma_divisores == n
+        Args:
+            n (int): Límite superior (incluido)
+            tamano_bloque (int): Cantidad de valores de a revisados por bloque
+            
+        Yields:
+            list: Los pares (a, b) encontrados en cada bloque que tenga alguno
+        """
+        # El compañero b puede caer en un bloque posterior, así que aquí
+        # necesitamos la criba completa
+        sigma = self.criba_sigma(n)
+        for lo in range(1, n + 1, tamano_bloque):
+            pares = []
+            for a in range(lo, min(lo + tamano_bloque, n + 1)):
+                b = sigma[a] - a
+                if a < b <= n and sigma[b] - b == a:
+                    pares.append((a, b))
+            if pares:
+                yield pares
     
     def triangulo_pascal(self, filas):
         """
@@ -114,90 +1684,259 @@ class Magic:
         Returns:
             list: Lista de listas que representa el triángulo de Pascal
         """
+        return list(self.filas_pascal(filas))
+    
+    def filas_pascal(self, filas):
+        """
+        Genera perezosamente las primeras n filas del triángulo de Pascal.
+        Solo se mantiene en memoria la fila anterior.
+        
+        Args:
+            filas (int): Número de filas a generar
+            
+        Returns:
+            generator: Generador de listas, una por fila
+        """
         if filas < 0:
             raise ValueError("Las filas no deben ser negativo")
-        if filas == 0:
-            return []
-        triangulo = [[1]]
-        for i in range(1, filas):
-            prev = triangulo[-1]
-            nueva_fila = [1]
-            for j in range(1, i):
-                nueva_fila.append(prev[j-1] + prev[j])
-            nueva_fila.append(1)
-            triangulo.append(nueva_fila)
-        return triangulo
+        return _iter_filas_pascal(filas)
+    
+    def fila_pascal(self, k):
+        """
+        Calcula directamente la fila k del triángulo de Pascal (la fila 0 es [1]).
+        Usa la fórmula multiplicativa C(k, j+1) = C(k, j) * (k - j) / (j + 1).
+        
+        Args:
+            k (int): Índice de la fila
+            
+        Returns:
+            list: Los coeficientes binomiales C(k, 0), ..., C(k, k)
+        """
+        if k < 0:
+            raise ValueError("La fila no debe ser negativa")
+        mitad = [1]
+        for j in range(k // 2):
+            mitad.append(mitad[-1] * (k - j) // (j + 1))
+        # La fila es simétrica: completamos la segunda mitad reflejando la primera
+        if k % 2 == 0:
+            return mitad + mitad[-2::-1]
+        return mitad + mitad[::-1]
+    
+    def binomial_mod(self, n, k, p):
+        """
+        Calcula el coeficiente binomial C(n, k) módulo un primo p con el teorema de Lucas.
+        
+        Args:
+            n (int): Tamaño del conjunto
+            k (int): Tamaño de la selección
+            p (int): Módulo primo
+            
+        Returns:
+            int: C(n, k) mod p
+        """
+        if not self.es_primo(p):
+            raise ValueError("El módulo debe ser primo")
+        if k < 0 or k > n:
+            return 0
+        
+        # C(n, k) = prod C(n_i, k_i) (mod p) sobre los dígitos de n y k en base p
+        resultado = 1
+        while k:
+            n, n_i = divmod(n, p)
+            k, k_i = divmod(k, p)
+            if k_i > n_i:
+                return 0
+            k_i = min(k_i, n_i - k_i)
+            numerador = denominador = 1
+            for j in range(k_i):
+                numerador = numerador * (n_i - j) % p
+                denominador = denominador * (j + 1) % p
+            resultado = resultado * numerador * pow(denominador, -1, p) % p
+        return resultado
+    
+    def factorial(self, n):
+        """
+        Calcula el factorial de un número.
+        Usa el algoritmo prime swing con productos en árbol equilibrado.
+        
+        Args:
+            n (int): Número para calcular su factorial
+            
+        Returns:
+            int: El factorial de n
+        """
+        if n < 0:
+            return 0
+        return _factorial_swing(n, _primos_base(n))
+    
+    def factorial_mod(self, n, m):
+        """
+        Calcula n! módulo m sin construir el factorial completo.
+        
+        Args:
+            n (int): Número para calcular su factorial
+            m (int): Módulo (mayor que 0)
+            
+        Returns:
+            int: n! mod m
+        """
+        if m <= 0:
+            raise ValueError("El módulo debe ser positivo")
+        if n < 0 or n >= m:
+            return 0  # m divide a n! cuando n >= m
+        
+        # Para m primo y n cercano a m usamos el teorema de Wilson:
+        # n! * (n+1) * ... * (m-1) = (m-1)! = -1 (mod m)
+        if 2 * n > m and self.es_primo(m):
+            resto = 1
+            for i in range(n + 1, m):
+                resto = resto * i % m
+            return -pow(resto, -1, m) % m
+        
+        resultado = 1 % m
+        for i in range(2, n + 1):
+            resultado = resultado * i % m
+        return resultado
+    
+    def mcd(self, a, b):
+        """
+        Calcula el máximo común divisor de dos números.
+        
+        Args:
+            a (int): Primer número
+            b (int): Segundo número
+            
+        Returns:
+            int: El máximo común divisor de a y b
+        """
+        # Convertimos a valores absolutos para manejar números negativos
+        a, b = abs(a), abs(b)
+        
+        # Algoritmo de Euclides
+        while b:
+            a, b = b, a % b
+        return a
+    
+    def mcm(self, a, b):
+        """
+        Calcula el mínimo común múltiplo de dos números.
+        
+        Args:
+            a (int): Primer número
+            b (int): Segundo número
+            
+        Returns:
+            int: El mínimo común múltiplo de a y b
+        """
+        if a == 0 or b == 0:
+            return 0
+        return abs(a * b) // self.mcd(a, b)
+    
+    def mcd_lote(self, a, b):
+        """
+        Calcula el máximo común divisor elemento a elemento de dos arreglos.
+        
+        Args:
+            a (array): Primer arreglo de enteros (ndarray de NumPy, array.array o lista)
+            b (array): Segundo arreglo de enteros, de la misma longitud
+            
+        Returns:
+            array: Arreglo con mcd(a[i], b[i]) del mismo tipo que la entrada
+        """
+        return _aplicar_por_elemento('gcd', math.gcd, a, b)
+    
+    def mcm_lote(self, a, b):
+        """
+        Calcula el mínimo común múltiplo elemento a elemento de dos arreglos.
+        
+        Args:
+            a (array): Primer arreglo de enteros (ndarray de NumPy, array.array o lista)
+            b (array): Segundo arreglo de enteros, de la misma longitud
+            
+        Returns:
+            array: Arreglo con mcm(a[i], b[i]); un array.array se devuelve con 64 bits
+                   ('q', o 'Q' si ambas entradas son sin signo), o como lista si no cabe.
+                   Con NumPy el cálculo se hace en 64 bits y un desbordamiento da la
+                   vuelta sin aviso, igual que con np.lcm sobre ndarray
+        """
+        return _aplicar_por_elemento('lcm', math.lcm, a, b, ampliar=True)
+    
+    def mcd_muchos(self, *numeros):
+        """
+        Calcula el máximo común divisor de varios números.
+        Reduce en árbol y termina en cuanto el resultado parcial llega a 1.
+        
+        Args:
+            *numeros (int): Números a reducir
+            
+        Returns:
+            int: El máximo común divisor de todos los números (0 si no hay ninguno)
+        """
+        if not numeros:
+            return 0
+        return _reducir_en_arbol(math.gcd, [abs(x) for x in numeros], 1)
     
-    def factorial(self, n):
+    def mcm_muchos(self, *numeros):
         """
-        Calcula el factorial de un número.
+        Calcula el mínimo común múltiplo de varios números.
+        Reduce en árbol y termina en cuanto aparece un 0.
         
         Args:
-            n (int): Número para calcular su factorial
+            *numeros (int): Números a reducir
             
         Returns:
-            int: El factorial de n
+            int: El mínimo común múltiplo de todos los números (1 si no hay ninguno)
         """
-        if n < 0:
-            return 0
-        if n == 0 or n == 1:
+        if not numeros:
             return 1
-        
-        resultado = 1
-        for i in range(2, n + 1):
-            resultado *= i
-        return resultado
+        return _reducir_en_arbol(math.lcm, [abs(x) for x in numeros], 0)
     
-    def mcd(self, a, b):
+    def suma_digitos(self, n):
         """
-        Calcula el máximo común divisor de dos números.
+        Calcula la suma de los dígitos de un número.
+        Recorre el número en bloques de 4 cifras y, si es muy grande, lo parte
+        recursivamente en base 10^k.
         
         Args:
-            a (int): Primer número
-            b (int): Segundo número
+            n (int): Número para sumar sus dígitos
             
         Returns:
-            int: El máximo común divisor de a y b
+            int: La suma de los dígitos de n
         """
-        # Convertimos a valores absolutos para manejar números negativos
-        a, b = abs(a), abs(b)
-        
-        # Algoritmo de Euclides
-        while b:
-            a, b = b, a % b
-        return a
+        n = abs(n)  # Trabajamos con el valor absoluto para manejar números negativos
+        k = _CIFRAS_PARTICION
+        while n >= _potencia_diez(2 * k):
+            k *= 2
+        return _suma_digitos_particion(n, k)
     
-    def mcm(self, a, b):
+    def suma_digitos_rango(self, a, b):
         """
-        Calcula el mínimo común múltiplo de dos números.
+        Calcula la suma de suma_digitos(k) para todos los k en [a, b].
+        Usa programación dinámica sobre las cifras, sin recorrer el intervalo.
         
         Args:
-            a (int): Primer número
-            b (int): Segundo número
+            a (int): Inicio del intervalo (incluido)
+            b (int): Fin del intervalo (incluido)
             
         Returns:
-            int: El mínimo común múltiplo de a y b
+            int: La suma de las sumas de dígitos del intervalo
         """
-        if a == 0 or b == 0:
-            return 0
-        return abs(a * b) // self.mcd(a, b)
+        return _sumar_en_rango(_suma_digitos_acumulada, a, b)
     
-    def suma_digitos(self, n):
+    def contar_con_suma_digitos(self, a, b, objetivo):
         """
-        Calcula la suma de los dígitos de un número.
+        Cuenta los enteros k en [a, b] cuya suma de dígitos es objetivo.
+        Usa programación dinámica sobre las cifras, sin recorrer el intervalo.
         
         Args:
-            n (int): Número para sumar sus dígitos
+            a (int): Inicio del intervalo (incluido)
+            b (int): Fin del intervalo (incluido)
+            objetivo (int): Suma de dígitos buscada
             
         Returns:
-            int: La suma de los dígitos de n
+            int: Cantidad de enteros del intervalo con esa suma de dígitos
         """
-        n = abs(n)  # Trabajamos con el valor absoluto para manejar números negativos
-        suma = 0
-        while n > 0:
-            suma += n % 10
-            n //= 10
-        return suma
+        return _sumar_en_rango(lambda n: _contar_suma_digitos_acumulada(n, objetivo), a, b)
     
     def es_numero_armstrong(self, n):
         """
@@ -223,16 +1962,36 @@ class Magic:
         
         return suma == n
     
+    def armstrong_hasta(self, digitos):
+        """
+        Encuentra todos los números de Armstrong que tienen hasta la cantidad de cifras indicada.
+        Revisa C(d+9, 9) multiconjuntos de dígitos por longitud en lugar de 10^d enteros.
+        
+        Args:
+            digitos (int): Cantidad máxima de cifras
+            
+        Returns:
+            list: Lista ordenada de los números de Armstrong (incluye del 0 al 9)
+        """
+        armstrong = []
+        for d in range(1, digitos + 1):
+            armstrong.extend(_armstrong_de_longitud(d))
+        return armstrong
+    
     def es_cuadrado_magico(self, matriz):
         """
         Verifica si una matriz es un cuadrado mágico (suma igual en filas, columnas y diagonales).
+        Los arreglos de NumPy y las matrices grandes se validan de forma vectorizada.
         
         Args:
-            matriz (list): Lista de listas que representa una matriz cuadrada
+            matriz (list): Lista de listas (o arreglo de NumPy) que representa una matriz cuadrada
             
         Returns:
             bool: True si es un cuadrado mágico, False en caso contrario
         """
+        if np is not None and isinstance(matriz, np.ndarray):
+            return self._es_cuadrado_magico_numpy(matriz)
+        
         # Verificar si la matriz está vacía
         if not matriz:
             return False
@@ -248,6 +2007,12 @@ class Magic:
         if n == 1:
             return True  # Según la prueba, [[5]] se considera un cuadrado mágico
 
+        # Para matrices grandes convertimos una sola vez y validamos con NumPy
+        if np is not None and n >= _UMBRAL_CUADRADO_NUMPY:
+            arreglo = np.asarray(matriz)
+            if arreglo.dtype.kind in 'iu':
+                return self._es_cuadrado_magico_numpy(arreglo)
+
         # Obtener todos los números de la matriz
         numeros = []
         for i in range(n):
@@ -283,4 +2048,643 @@ class Magic:
         if suma_diagonal_secundaria != suma_esperada:
             return False
 
-        return True
\ No newline at end of file
+        return True
+    
+    def filas_cuadrado_magico(self, n):
+        """
+        Genera una a una las filas de un cuadrado mágico de orden n.
+        Cada fila se calcula directamente, así que solo una fila ocupa memoria.
+        
+        Args:
+            n (int): Orden del cuadrado (cualquier n >= 1 salvo 2)
+            
+        Returns:
+            generator: Generador de filas, cada una como array de enteros
+        """
+        _validar_orden_cuadrado(n)
+        tipo = 'I' if n * n < 1 << 32 else 'Q'
+        return (array(tipo, _fila_cuadrado_magico(n, i)) for i in range(n))
+    
+    def generar_cuadrado_magico(self, n):
+        """
+        Construye un cuadrado mágico de orden n en O(n²).
+        Usa el método siamés para n impar, el complemento en diagonales para n
+        múltiplo de 4 y el método LUX para n = 4m + 2.
+        
+        Args:
+            n (int): Orden del cuadrado (cualquier n >= 1 salvo 2)
+            
+        Returns:
+            ndarray: Matriz n x n de NumPy, o una lista de filas array si NumPy no está disponible
+        """
+        if np is None:
+            return list(self.filas_cuadrado_magico(n))
+        _validar_orden_cuadrado(n)
+        
+        # Escribimos por bloques de filas en un arreglo reservado de antemano
+        cuadrado = np.empty((n, n), dtype=np.uint32 if n * n < 1 << 32 else np.uint64)
+        j = np.arange(n, dtype=np.int64)[None, :]
+        filas_por_bloque = max(1, _CELDAS_POR_BLOQUE // n)
+        for inicio in range(0, n, filas_por_bloque):
+            fin = min(inicio + filas_por_bloque, n)
+            i = np.arange(inicio, fin, dtype=np.int64)[:, None]
+            cuadrado[inicio:fin] = _bloque_cuadrado_magico(n, i, j)
+        return cuadrado
+    
+    def buscar_cuadrados_magicos(self, n, fijas=None, procesos=None, limite=None,
+                                 solo_contar=False, tiempo_limite=None, token=None):
+        """
+        Busca (o cuenta) los cuadrados mágicos de orden n que respetan celdas fijas.
+        Reparte el árbol de búsqueda entre procesos según los valores de las
+        primeras celdas y poda con las sumas de filas, columnas y diagonales.
+        
+        Args:
+            n (int): Orden del cuadrado
+            fijas (dict): Celdas fijas {(fila, columna): valor}
+            procesos (int): Procesos trabajadores (None usa todos los núcleos, 1 no crea procesos)
+            limite (int): Cantidad máxima de cuadrados a encontrar (None sin límite)
+            solo_contar (bool): Si es True solo se cuentan los cuadrados
+            tiempo_limite (float): Segundos tras los que se detiene la búsqueda
+            token (TokenCancelacion): Token para cancelar la búsqueda desde fuera
+            
+        Returns:
+            dict: cuadrados, cantidad, nodos, segundos, nodos_por_segundo y completa
+                  (False si se canceló o se venció el tiempo)
+        """
+        _validar_orden_cuadrado(n)
+        total = n * n
+        posiciones = {}
+        for (fila, columna), valor in (fijas or {}).items():
+            if not (0 <= fila < n and 0 <= columna < n) or not 1 <= valor <= total:
+                raise ValueError("Celda fija fuera del cuadrado")
+            posiciones[fila * n + columna] = valor
+        if len(set(posiciones.values())) != len(posiciones):
+            raise ValueError("Las celdas fijas no deben repetir valores")
+        if procesos is None:
+            procesos = os.cpu_count() or 1
+        
+        inicio = time.perf_counter()
+        interno = TokenCancelacion(tiempo_limite)
+        if procesos <= 1:
+            tokens = (interno,) if token is None else (interno, token)
+            resultado = _explorar_cuadrados(n, posiciones, (), limite, solo_contar, tokens)
+            nodos, cantidad = resultado["nodos"], resultado["cantidad"]
+            cuadrados, completa = resultado["cuadrados"], resultado["completa"]
+        else:
+            division = _dividir_busqueda(n, posiciones, _UNIDADES_POR_PROCESO * procesos)
+            nodos, cantidad, cuadrados, completa = division["nodos"], 0, [], True
+            with ProcessPoolExecutor(procesos, initializer=_inicializar_trabajador,
+                                     initargs=(interno,)) as ejecutor:
+                pendientes = {ejecutor.submit(_tarea_cuadrados, n, posiciones, prefijo, limite, solo_contar)
+                              for prefijo in division["prefijos"]}
+                while pendientes:
+                    listos, pendientes = wait(pendientes, timeout=0.05, return_when=FIRST_COMPLETED)
+                    for futuro in listos:
+                        if futuro.cancelled():
+                            continue
+                        parcial = futuro.result()
+                        nodos += parcial["nodos"]
+                        cantidad += parcial["cantidad"]
+                        cuadrados.extend(parcial["cuadrados"])
+                        completa = completa and parcial["completa"]
+                    cancelar = (token is not None and token.cancelado()) or interno.cancelado()
+                    if cancelar or (limite is not None and cantidad >= limite):
+                        # Detenemos los trabajos en curso y descartamos los que no empezaron
+                        interno.cancelar()
+                        for futuro in pendientes:
+                            futuro.cancel()
+                        completa = completa and not cancelar
+            if limite is not None and cantidad >= limite:
+                cantidad, cuadrados, completa = limite, cuadrados[:limite], True
+        
+        segundos = time.perf_counter() - inicio
+        return {
+            "cuadrados": cuadrados,
+            "cantidad": cantidad,
+            "nodos": nodos,
+            "segundos": segundos,
+            "nodos_por_segundo": nodos / segundos if segundos > 0 else 0.0,
+            "completa": completa
+        }
+    
+    def _es_cuadrado_magico_numpy(self, arreglo):
+        """
+        Versión vectorizada de es_cuadrado_magico para arreglos de NumPy.
+        Si los números forman una permutación de 1..n², cada fila, columna y diagonal
+        debe sumar n(n² + 1)/2, así que se compara contra esa constante y se termina
+        en la primera verificación que falle.
+        
+        Args:
+            arreglo (ndarray): Arreglo de NumPy con la matriz
+            
+        Returns:
+            bool: True si es un cuadrado mágico, False en caso contrario
+        """
+        if arreglo.ndim != 2 or arreglo.shape[0] != arreglo.shape[1] or arreglo.size == 0:
+            return False
+        n = arreglo.shape[0]
+        if n == 1:
+            return True
+        if arreglo.dtype.kind not in 'iu':
+            # Valores no enteros: usamos la verificación general
+            return self.es_cuadrado_magico(arreglo.tolist())
+        
+        arreglo = arreglo.astype(np.int64, copy=False)
+        objetivo = n * (n * n + 1) // 2
+        if not (arreglo.sum(axis=1) == objetivo).all():
+            return False
+        if not (arreglo.sum(axis=0) == objetivo).all():
+            return False
+        if arreglo.trace() != objetivo:
+            return False
+        if np.fliplr(arreglo).trace() != objetivo:
+            return False
+        
+        # Verificar que los números sean una permutación de 1 a n^2
+        plano = arreglo.ravel()
+        if plano.min() < 1 or plano.max() > n * n:
+            return False
+        return bool((np.bincount(plano, minlength=n * n + 1)[1:] == 1).all())
+
+
+class CachePisano:
+    """
+    Caché LRU acotada de periodos de Pisano para consultas F(n) mod m repetidas.
+    Guarda, por cada módulo, la tabla de residuos de un periodo completo, de modo
+    que tras la primera consulta de un módulo las siguientes cuestan O(1).
+    """
+    
+    def __init__(self, capacidad=64):
+        """
+        Args:
+            capacidad (int): Cantidad máxima de módulos que se mantienen en caché
+        """
+        if capacidad <= 0:
+            raise ValueError("La capacidad debe ser positiva")
+        self.capacidad = capacidad
+        self.aciertos = 0
+        self.fallos = 0
+        self._tablas = OrderedDict()
+    
+    def tabla(self, m):
+        """
+        Devuelve los residuos F(0), ..., F(π(m) - 1) módulo m.
+        
+        Args:
+            m (int): Módulo (mayor que 0)
+            
+        Returns:
+            array: Tabla de residuos de un periodo completo
+        """
+        if m <= 0:
+            raise ValueError("El módulo debe ser positivo")
+        tabla = self._tablas.get(m)
+        if tabla is not None:
+            self.aciertos += 1
+            self._tablas.move_to_end(m)
+            return tabla
+        
+        self.fallos += 1
+        tabla = array('Q', [0])
+        if m > 1:
+            # Recorremos la recurrencia módulo m hasta que el par (0, 1) se repite
+            a, b = 1, 1
+            while (a, b) != (0, 1):
+                tabla.append(a)
+                a, b = b, (a + b) % m
+        self._tablas[m] = tabla
+        if len(self._tablas) > self.capacidad:
+            self._tablas.popitem(last=False)
+        return tabla
+    
+    def periodo(self, m):
+        """
+        Calcula el periodo de Pisano π(m).
+        
+        Args:
+            m (int): Módulo (mayor que 0)
+            
+        Returns:
+            int: Longitud del periodo de F(n) mod m
+        """
+        return len(self.tabla(m))
+    
+    def fibonacci_mod(self, n, m):
+        """
+        Calcula F(n) mod m consultando la tabla del periodo.
+        
+        Args:
+            n (int): Posición en la secuencia (empezando desde 0)
+            m (int): Módulo (mayor que 0)
+            
+        Returns:
+            int: F(n) mod m
+        """
+        tabla = self.tabla(m)
+        if n < 0:
+            return 0
+        return tabla[n % len(tabla)]
+    
+    def estadisticas(self):
+        """
+        Devuelve los contadores de la caché para dimensionarla.
+        
+        Returns:
+            dict: Aciertos, fallos, módulos en caché y capacidad
+        """
+        return {
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tamano": len(self._tablas),
+            "capacidad": self.capacidad
+        }
+
+
+class TablaFactoriales:
+    """
+    Tabla precalculada de factoriales e inversos de factoriales módulo un primo p.
+    Permite responder combinaciones y permutaciones módulo p en O(1).
+    """
+    
+    def __init__(self, n, p):
+        """
+        Args:
+            n (int): Mayor valor cuyo factorial se guarda
+            p (int): Módulo primo, mayor que n
+        """
+        if n < 0:
+            raise ValueError("n no debe ser negativo")
+        if p <= n or not Magic().es_primo(p):
+            raise ValueError("El módulo debe ser un primo mayor que n")
+        self.n = n
+        self.p = p
+        
+        # Los residuos caben en array('Q') salvo para módulos de más de 64 bits
+        tipo = (lambda valores: array('Q', valores)) if p < 1 << 64 else list
+        factoriales = tipo([1]) * (n + 1)
+        for i in range(1, n + 1):
+            factoriales[i] = factoriales[i - 1] * i % p
+        inversos = tipo([1]) * (n + 1)
+        inversos[n] = pow(factoriales[n], -1, p)
+        for i in range(n, 0, -1):
+            inversos[i - 1] = inversos[i] * i % p
+        self._factoriales = factoriales
+        self._inversos = inversos
+    
+    def factorial(self, k):
+        """
+        Args:
+            k (int): Valor entre 0 y n
+            
+        Returns:
+            int: k! mod p
+        """
+        return self._factoriales[k]
+    
+    def inverso_factorial(self, k):
+        """
+        Args:
+            k (int): Valor entre 0 y n
+            
+        Returns:
+            int: Inverso modular de k! módulo p
+        """
+        return self._inversos[k]
+    
+    def combinaciones(self, n, k):
+        """
+        Calcula el coeficiente binomial C(n, k) módulo p.
+        
+        Args:
+            n (int): Tamaño del conjunto (hasta el n de la tabla)
+            k (int): Tamaño de la selección
+            
+        Returns:
+            int: C(n, k) mod p, o 0 si k está fuera de [0, n]
+        """
+        if k < 0 or k > n:
+            return 0
+        return self._factoriales[n] * self._inversos[k] % self.p * self._inversos[n - k] % self.p
+    
+    def permutaciones(self, n, k):
+        """
+        Calcula las variaciones P(n, k) = n! / (n - k)! módulo p.
+        
+        Args:
+            n (int): Tamaño del conjunto (hasta el n de la tabla)
+            k (int): Tamaño de la selección ordenada
+            
+        Returns:
+            int: P(n, k) mod p, o 0 si k está fuera de [0, n]
+        """
+        if k < 0 or k > n:
+            return 0
+        return self._factoriales[n] * self._inversos[n - k] % self.p
+
+
+class BitsetPrimos:
+    """
+    Tabla de primos persistente en disco, de solo impares y un bit por impar,
+    que se lee con mmap. Varios procesos que abren el mismo archivo comparten una
+    sola copia en la caché de páginas del sistema operativo.
+    
+    Formato: una cabecera de 32 bytes (firma, versión, límite y CRC32 de los datos)
+    seguida de los bits, donde el bit i indica si el impar 2i + 1 es primo.
+    """
+    
+    FIRMA = b'PRIMBITS'
+    VERSION = 1
+    _CABECERA = struct.Struct('<8sIIQI4x')
+    # Bytes leídos por bloque al recorrer la tabla
+    _BLOQUE_LECTURA = 1 << 16
+    
+    def __init__(self, ruta, verificar=True):
+        """
+        Args:
+            ruta (str): Archivo con la tabla
+            verificar (bool): Si es True comprueba el CRC32 de los datos al abrir
+        """
+        self.ruta = ruta
+        with open(ruta, 'rb') as archivo:
+            if os.fstat(archivo.fileno()).st_size < self._CABECERA.size:
+                raise ValueError("El archivo no es una tabla de primos compatible")
+            self._mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            firma, version, _, limite, crc = self._CABECERA.unpack_from(self._mapa)
+            if firma != self.FIRMA or version != self.VERSION:
+                raise ValueError("El archivo no es una tabla de primos compatible")
+            if len(self._mapa) != self._CABECERA.size + -(-((limite + 1) // 2) // 8):
+                raise ValueError("El tamaño del archivo no coincide con su límite")
+            if verificar:
+                with memoryview(self._mapa) as vista:
+                    if zlib.crc32(vista[self._CABECERA.size:]) != crc:
+                        raise ValueError("La suma de verificación de la tabla no coincide")
+        except ValueError:
+            self._mapa.close()
+            raise
+        self.limite = limite
+    
+    @classmethod
+    def construir(cls, ruta, limite):
+        """
+        Crea la tabla hasta limite o extiende una existente con un límite menor.
+        Solo se criba el tramo nuevo; el archivo se reemplaza de forma atómica, así
+        que los procesos que ya lo tenían abierto siguen viendo la versión anterior.
+        
+        Args:
+            ruta (str): Archivo de la tabla
+            limite (int): Mayor número que debe cubrir la tabla
+            
+        Returns:
+            BitsetPrimos: La tabla abierta
+        """
+        bits_previos = 0
+        crc = 0
+        if os.path.exists(ruta):
+            with cls(ruta) as actual:
+                if actual.limite >= limite:
+                    return cls(ruta, verificar=False)
+                bits_previos = (actual.limite + 1) // 2
+        # Se vuelve a cribar desde el último byte completo
+        bytes_previos = bits_previos // 8
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        try:
+            if bytes_previos:
+                shutil.copyfile(ruta, temporal)
+            with open(temporal, 'r+b' if bytes_previos else 'wb') as archivo:
+                archivo.truncate(cls._CABECERA.size + bytes_previos)
+                if bytes_previos:
+                    archivo.seek(cls._CABECERA.size)
+                    crc = zlib.crc32(archivo.read(bytes_previos))
+                archivo.seek(cls._CABECERA.size + bytes_previos)
+                for _, segmento in _segmentos_criba(16 * bytes_previos + 1, limite + 1):
+                    datos = _empaquetar_bits(segmento)
+                    crc = zlib.crc32(datos, crc)
+                    archivo.write(datos)
+                archivo.seek(0)
+                archivo.write(cls._CABECERA.pack(cls.FIRMA, cls.VERSION, 0, max(limite, 0), crc))
+            os.replace(temporal, ruta)
+        finally:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+        return cls(ruta, verificar=False)
+    
+    def es_primo(self, n):
+        """
+        Verifica si un número es primo leyendo su bit en la tabla.
+        
+        Args:
+            n (int): Número a verificar (hasta el límite de la tabla)
+            
+        Returns:
+            bool: True si n es primo, False en caso contrario
+        """
+        if n > self.limite:
+            raise ValueError("El número supera el límite de la tabla")
+        if n < 3 or n % 2 == 0:
+            return n == 2
+        i = n // 2
+        return bool(self._mapa[self._CABECERA.size + (i >> 3)] >> (i & 7) & 1)
+    
+    def iter_primos(self, lo, hi):
+        """
+        Genera los números primos en el intervalo [lo, hi) leyendo la tabla por bloques.
+        
+        Args:
+            lo (int): Inicio del intervalo (incluido)
+            hi (int): Fin del intervalo (excluido, hasta límite + 1)
+            
+        Yields:
+            int: Los primos del intervalo en orden creciente
+        """
+        if hi > self.limite + 1:
+            raise ValueError("El intervalo supera el límite de la tabla")
+        if lo <= 2 < hi:
+            yield 2
+        # Índices de los impares de [max(lo, 3), hi)
+        primero, ultimo = max(lo, 3) // 2, hi // 2
+        base = self._CABECERA.size
+        bloque = self._BLOQUE_LECTURA
+        for byte in range(primero // 8, -(-ultimo // 8), bloque):
+            bits = _desempaquetar_bits(self._mapa[base + byte:base + byte + bloque])
+            desde = max(primero - 8 * byte, 0)
+            hasta = min(ultimo - 8 * byte, len(bits))
+            inicio = 2 * (8 * byte + desde) + 1
+            yield from compress(range(inicio, inicio + 2 * (hasta - desde), 2), bits[desde:hasta])
+    
+    def cerrar(self):
+        """
+        Libera el mapeo del archivo.
+        """
+        self._mapa.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *_):
+        self.cerrar()
+
+
+class TablaAritmetica:
+    """
+    Tablas de menor factor primo, φ de Euler, μ de Möbius y cantidad de divisores
+    (σ0) hasta un límite, guardadas en arrays compactos con consultas O(1).
+    
+    Las cuatro se llenan en una sola pasada lineal: cada i = p * m, con p su menor
+    factor primo, se obtiene de m según p divida o no a m, como en la criba de Euler.
+    """
+    
+    FIRMA = b'TABLARIT'
+    VERSION = 1
+    _CABECERA = struct.Struct('<8sIIQI4x')
+    # Tipos de las tablas en el orden en que se guardan en disco
+    _TIPOS = ('I', 'I', 'b', 'H')
+    
+    def __init__(self, limite):
+        """
+        Args:
+            limite (int): Mayor número cubierto por las tablas (menor que 2^32)
+        """
+        if not 0 < limite < 1 << 32:
+            raise ValueError("El límite debe estar entre 1 y 2^32 - 1")
+        self.limite = limite
+        # Un 0 en la tabla de menor factor primo indica que el índice es primo
+        self._spf = spf = _construir_spf(limite)
+        self._phi = phi = array('I', bytes(4 * (limite + 1)))
+        self._mu = mu = array('b', bytes(limite + 1))
+        self._divisores = divisores = array('H', bytes(2 * (limite + 1)))
+        # Exponente del menor factor primo de cada índice
+        exponente = bytearray(limite + 1)
+        phi[1] = mu[1] = divisores[1] = 1
+        for i in range(2, limite + 1):
+            p = spf[i]
+            if not p:
+                phi[i] = i - 1
+                mu[i] = -1
+                divisores[i] = 2
+                exponente[i] = 1
+                continue
+            m = i // p
+            if (spf[m] or m) == p:
+                e = exponente[m]
+                exponente[i] = e + 1
+                phi[i] = phi[m] * p
+                divisores[i] = divisores[m] // (e + 1) * (e + 2)
+            else:
+                exponente[i] = 1
+                phi[i] = phi[m] * (p - 1)
+                mu[i] = -mu[m]
+                divisores[i] = 2 * divisores[m]
+    
+    def _validar(self, n):
+        if not 1 <= n <= self.limite:
+            raise ValueError("El número debe estar entre 1 y el límite de la tabla")
+    
+    def menor_factor_primo(self, n):
+        """
+        Args:
+            n (int): Número entre 1 y el límite
+            
+        Returns:
+            int: El menor factor primo de n (1 para n = 1)
+        """
+        self._validar(n)
+        return self._spf[n] or n
+    
+    def phi(self, n):
+        """
+        Args:
+            n (int): Número entre 1 y el límite
+            
+        Returns:
+            int: φ(n), la cantidad de enteros en [1, n] coprimos con n
+        """
+        self._validar(n)
+        return self._phi[n]
+    
+    def mobius(self, n):
+        """
+        Args:
+            n (int): Número entre 1 y el límite
+            
+        Returns:
+            int: μ(n): 0 si n tiene un factor cuadrado, si no (-1)^(cantidad de primos)
+        """
+        self._validar(n)
+        return self._mu[n]
+    
+    def cantidad_divisores(self, n):
+        """
+        Args:
+            n (int): Número entre 1 y el límite
+            
+        Returns:
+            int: σ0(n), la cantidad de divisores positivos de n
+        """
+        self._validar(n)
+        return self._divisores[n]
+    
+    def guardar(self, ruta):
+        """
+        Guarda las tablas en disco (little-endian, con CRC32), reemplazando el
+        archivo de forma atómica.
+        
+        Args:
+            ruta (str): Archivo de destino
+        """
+        datos = []
+        for tabla in (self._spf, self._phi, self._mu, self._divisores):
+            if sys.byteorder == 'big':
+                tabla = array(tabla.typecode, tabla)
+                tabla.byteswap()
+            datos.append(tabla.tobytes())
+        crc = 0
+        for bloque in datos:
+            crc = zlib.crc32(bloque, crc)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        try:
+            with open(temporal, 'wb') as archivo:
+                archivo.write(self._CABECERA.pack(self.FIRMA, self.VERSION, 0, self.limite, crc))
+                for bloque in datos:
+                    archivo.write(bloque)
+            os.replace(temporal, ruta)
+        finally:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+    
+    @classmethod
+    def cargar(cls, ruta):
+        """
+        Lee unas tablas guardadas con guardar sin volver a cribar.
+        
+        Args:
+            ruta (str): Archivo de origen
+            
+        Returns:
+            TablaAritmetica: Las tablas leídas
+        """
+        with open(ruta, 'rb') as archivo:
+            contenido = archivo.read()
+        try:
+            firma, version, _, limite, crc = cls._CABECERA.unpack_from(contenido)
+        except struct.error:
+            raise ValueError("El archivo no es una tabla aritmética compatible") from None
+        if firma != cls.FIRMA or version != cls.VERSION:
+            raise ValueError("El archivo no es una tabla aritmética compatible")
+        tamanos = [array(tipo).itemsize * (limite + 1) for tipo in cls._TIPOS]
+        if len(contenido) != cls._CABECERA.size + sum(tamanos):
+            raise ValueError("El tamaño del archivo no coincide con su límite")
+        if zlib.crc32(memoryview(contenido)[cls._CABECERA.size:]) != crc:
+            raise ValueError("La suma de verificación de la tabla no coincide")
+        tablas = []
+        inicio = cls._CABECERA.size
+        for tipo, tamano in zip(cls._TIPOS, tamanos):
+            tabla = array(tipo, contenido[inicio:inicio + tamano])
+            if sys.byteorder == 'big':
+                tabla.byteswap()
+            tablas.append(tabla)
+            inicio += tamano
+        tabla = cls.__new__(cls)
+        tabla.limite = limite
+        tabla._spf, tabla._phi, tabla._mu, tabla._divisores = tablas
+        return tabla
@@ -1,5 +1,11 @@
+from decimal import Decimal
+from fractions import Fraction
+import os
+import subprocess
+import sys
+
 import pytest
-from src.data.data import Data
+from src.data.data import Data, FiltroBloom, HyperLogLog
 
 class TestData:
     def setup_method(self):
@@ -25,6 +31,15 @@ class TestData:
         # Test con lista vacía
         assert self.data.buscar_elemento([], 42) == -1
     
+    def test_buscar_elemento_con_filtro(self):
+        # Test con un filtro de Bloom que descarta los ausentes sin recorrer la lista
+        lista = list(range(0, 2000, 2))
+        filtro = FiltroBloom(len(lista), 0.001)
+        filtro.agregar_todos(lista)
+        assert self.data.buscar_elemento(lista, 1998, filtro) == 999
+        assert self.data.buscar_elemento(lista, 1999, filtro) == -1
+        assert self.data.buscar_elemento(lista, 4.0, filtro) == 2
+    
     def test_eliminar_duplicados(self):
         # Test con lista con duplicados
         assert self.data.eliminar_duplicados([1, 2, 2, 3, 4, 4, 5]) == [1, 2, 3, 4, 5]
@@ -35,6 +50,55 @@ class TestData:
         # Test con valores de diferentes tipos
         assert self.data.eliminar_duplicados([1, "a", 1, "a", True]) == [1, "a", True]
     
+    def test_eliminar_duplicados_no_hashables(self):
+        # Test con listas y diccionarios, respetando la distinción por tipo
+        lista = [[1, 2], {"a": 1}, [1, 2], (1, 2), [1.0, 2], {"a": 1}, [[1], 2], [[1], 2]]
+        assert self.data.eliminar_duplicados(lista) == [[1, 2], {"a": 1}, (1, 2), [[1], 2]]
+        assert self.data.eliminar_duplicados([[1], [True], 1, True, 1.0]) == [[1], 1, True, 1.0]
+    
+    def test_iter_sin_duplicados(self):
+        # Test para el generador con clave
+        registros = [{"id": 1, "v": "a"}, {"id": 2, "v": "b"}, {"id": 1, "v": "c"}]
+        resultado = self.data.iter_sin_duplicados(registros, key=lambda r: r["id"])
+        assert next(resultado) == {"id": 1, "v": "a"}
+        assert list(resultado) == [{"id": 2, "v": "b"}]
+        # Test con un iterable que no es una lista
+        assert list(self.data.iter_sin_duplicados(x % 3 for x in range(10))) == [0, 1, 2]
+        assert self.data.eliminar_duplicados(["a", "B", "A", "b"], key=str.lower) == ["a", "B"]
+    
+    def test_eliminar_duplicados_externo(self, tmp_path):
+        # Test con un presupuesto mínimo para forzar el uso de archivos temporales
+        lista = [(i * 7919) % 1000 for i in range(5000)] + [[1], [1.0], True, 1, "1"]
+        resultado = self.data.eliminar_duplicados_externo(lista, memoria=1000, directorio=str(tmp_path))
+        assert list(resultado) == self.data.eliminar_duplicados(lista)
+        assert list(tmp_path.iterdir()) == []
+        # Test con clave y con todo el flujo en memoria
+        palabras = ["Hola", "mundo", "HOLA", "Mundo", "adiós"]
+        esperado = ["Hola", "mundo", "adiós"]
+        assert list(self.data.eliminar_duplicados_externo(palabras, key=str.lower)) == esperado
+        assert list(self.data.eliminar_duplicados_externo(palabras, memoria=10, key=str.lower)) == esperado
+        assert list(self.data.eliminar_duplicados_externo([])) == []
+    
+    def test_eliminar_duplicados_externo_pocos_descriptores(self, tmp_path):
+        # Test con muchas corridas y un límite bajo de archivos abiertos
+        resource = pytest.importorskip("resource")
+        blando, duro = resource.getrlimit(resource.RLIMIT_NOFILE)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (128, duro))
+        try:
+            lista = [i % 40000 for i in range(60000)]
+            resultado = self.data.eliminar_duplicados_externo(lista, memoria=2000, directorio=str(tmp_path))
+            assert list(resultado) == list(range(40000))
+        finally:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (blando, duro))
+        assert list(tmp_path.iterdir()) == []
+    
+    def test_contar_distintos(self):
+        # Test con conteos exactos en cardinalidades pequeñas y aproximados en grandes
+        assert self.data.contar_distintos([]) == 0
+        assert self.data.contar_distintos([1, True, 1, "1", 1.0]) == 4
+        estimacion = self.data.contar_distintos(f"elemento {i % 20000}" for i in range(60000))
+        assert abs(estimacion - 20000) < 20000 * 0.05
+    
     def test_merge_ordenado(self):
         # Test con listas de enteros ordenadas
         assert self.data.merge_ordenado([1, 3, 5], [2, 4, 6]) == [1, 2, 3, 4, 5, 6]
@@ -73,6 +137,38 @@ class TestData:
         # Test con conjunto vacío
         assert self.data.es_subconjunto([], [1, 2, 3]) == True
     
+    def test_es_subconjunto_grande(self):
+        # Test con listas grandes que usan el índice hash
+        conjunto2 = list(range(100000))
+        assert self.data.es_subconjunto(list(range(0, 100000, 3)), conjunto2) == True
+        assert self.data.es_subconjunto(list(range(99990, 100001)), conjunto2) == False
+        assert self.data.es_subconjunto([5] * 200000, [5]) == True
+    
+    def test_es_subconjunto_no_hashables(self):
+        # Test con listas y diccionarios, incluidos los iguales a un hashable
+        conjunto2 = [[i] for i in range(100)] + [{"a": 1}, b"xy", 7]
+        assert self.data.es_subconjunto([[5], {"a": 1}, [99], 7, [7.0]], conjunto2) == True
+        assert self.data.es_subconjunto([[5], [100]], conjunto2) == False
+        assert self.data.es_subconjunto([bytearray(b"xy")] * 100, conjunto2) == True
+    
+    def test_es_subconjunto_con_filtro(self):
+        # Test con un filtro de Bloom de conjunto2
+        conjunto2 = [[1, 2], "a", b"x", 3] + list(range(10, 5000))
+        filtro = FiltroBloom(len(conjunto2), 0.001)
+        filtro.agregar_todos(conjunto2)
+        assert self.data.es_subconjunto([[1.0, 2], "a", bytearray(b"x"), True], conjunto2, filtro=filtro) == False
+        assert self.data.es_subconjunto([[1.0, 2], "a", bytearray(b"x"), 3.0], conjunto2, filtro=filtro) == True
+        assert self.data.es_subconjunto([5000], conjunto2, filtro=filtro) == False
+    
+    def test_es_subconjunto_multiconjunto(self):
+        # Test donde también deben alcanzar las repeticiones
+        assert self.data.es_subconjunto([1, 1, 2], [1, 2, 1, 3], multiconjunto=True) == True
+        assert self.data.es_subconjunto([1, 1, 2], [1, 2, 3], multiconjunto=True) == False
+        assert self.data.es_subconjunto([1, 1, 2], [1, 2, 3]) == True
+        conjunto2 = [[1], [2], [1]] + list(range(3000))
+        assert self.data.es_subconjunto([[1], [1]], conjunto2, multiconjunto=True) == True
+        assert self.data.es_subconjunto([[1], [1], [1]], conjunto2, multiconjunto=True) == False
+    
     def test_implementar_pila(self):
         pila = self.data.implementar_pila()
         # Test de pila vacía
@@ -113,4 +209,113 @@ class TestData:
         # Test con matriz 1x1
         assert self.data.matriz_transpuesta([[5]]) == [[5]]
         # Test con matriz vacía
-        assert self.data.matriz_transpuesta([]) == []
\ No newline at end of file
+        assert self.data.matriz_transpuesta([]) == []
+
+
+class TestHyperLogLog:
+    def test_fusionar(self):
+        # Test para fusionar sketches de flujos que se solapan
+        a = HyperLogLog(12)
+        b = HyperLogLog(12)
+        a.agregar_todos(range(30000))
+        b.agregar_todos(range(20000, 50000))
+        assert abs(a.fusionar(b).cardinalidad() - 50000) < 50000 * 0.06
+        with pytest.raises(ValueError):
+            a.fusionar(HyperLogLog(10))
+    
+    def test_igualdad_como_eliminar_duplicados(self):
+        # Test con valores que eliminar_duplicados considera repetidos
+        datos = [{"a": 1, "b": 2}, {"b": 2, "a": 1}, 0.0, -0.0, {"x", "y"}, {"y", "x"}, 1, True]
+        sketch = HyperLogLog(10)
+        sketch.agregar_todos(datos)
+        assert sketch.cardinalidad() == len(Data().eliminar_duplicados(datos)) == 5
+    
+    def test_independiente_de_la_semilla_hash(self):
+        # Test con procesos que usan semillas de hash distintas
+        codigo = ("from src.data.data import HyperLogLog; s = HyperLogLog(4); "
+                  "s.agregar_todos([frozenset('abcdef'), {'k': {'a', 'b'}}]); print(s.a_bytes().hex())")
+        salidas = set()
+        for semilla in ("1", "2", "3"):
+            entorno = dict(os.environ, PYTHONHASHSEED=semilla)
+            salidas.add(subprocess.run([sys.executable, "-c", codigo], env=entorno, check=True,
+                                       capture_output=True, text=True).stdout)
+        assert len(salidas) == 1
+    
+    def test_serializacion(self):
+        # Test para guardar y reconstruir el estado
+        sketch = HyperLogLog(8)
+        sketch.agregar_todos("abcdefghij")
+        datos = sketch.a_bytes()
+        assert len(datos) == 257
+        assert HyperLogLog.desde_bytes(datos).cardinalidad() == sketch.cardinalidad() == 10
+        with pytest.raises(ValueError):
+            HyperLogLog.desde_bytes(datos[:-1])
+        with pytest.raises(ValueError):
+            HyperLogLog.desde_bytes(b"")
+        with pytest.raises(ValueError):
+            HyperLogLog(3)
+
+
+class TestFiltroBloom:
+    def setup_method(self):
+        self.data = Data()
+    
+    def test_tasa_de_error(self):
+        # Test sin falsos negativos y con falsos positivos cerca de la tasa pedida
+        filtro = FiltroBloom(10000, 0.01)
+        filtro.agregar_todos(range(10000))
+        assert all(x in filtro for x in range(10000))
+        falsos = sum(1 for x in range(10000, 30000) if x in filtro)
+        assert falsos < 20000 * 0.02
+        assert 1 in filtro and True in filtro and 1.0 in filtro
+        with pytest.raises(ValueError):
+            FiltroBloom(10, tasa_error=1.5)
+    
+    def test_valores_iguales(self):
+        # Test sin falsos negativos para valores iguales con otra representación
+        referencia = [{"a": 1, "b": 2}, frozenset({1, 2}), Fraction(1, 2), complex(3, 0), Decimal("2.5"), -0.0]
+        filtro = FiltroBloom(100)
+        filtro.agregar_todos(referencia)
+        for consulta in [{"b": 2, "a": 1}, {1, 2}, 0.5, 3, 2.5, 0]:
+            assert consulta in filtro
+            assert self.data.buscar_elemento(referencia, consulta, filtro) == self.data.buscar_elemento(referencia, consulta)
+        assert self.data.es_subconjunto([{"b": 2, "a": 1}], referencia, filtro=filtro) == True
+    
+    def test_valores_sin_codificacion(self):
+        # Test para tipos sin codificación coherente con ==
+        class Siete:
+            def __eq__(self, otro):
+                return otro == 7
+            __hash__ = None
+        filtro = FiltroBloom(100)
+        filtro.agregar_todos(["a", object()])
+        assert object() in filtro
+        assert "b" not in filtro
+        filtro.agregar(Siete())
+        assert filtro.inciertos == 1
+        assert 7 in filtro and self.data.buscar_elemento(["a", Siete()], 7, filtro) == 1
+    
+    def test_numpy(self):
+        # Test con escalares de NumPy iguales a números de Python
+        np = pytest.importorskip("numpy")
+        filtro = FiltroBloom(100)
+        filtro.agregar_todos([np.int64(5), np.float32(0.25)])
+        assert 5 in filtro and 0.25 in filtro and 5.0 in filtro
+    
+    def test_persistencia(self, tmp_path):
+        # Test con bits respaldados por un archivo y con guardar y cargar
+        ruta = str(tmp_path / "filtro.bin")
+        with FiltroBloom(100, ruta=ruta) as filtro:
+            filtro.agregar_todos(["a", "b", [1, 2]])
+        with FiltroBloom.cargar(ruta, mapear=True) as filtro:
+            assert filtro.cantidad == 3
+            assert "a" in filtro and [1, 2] in filtro
+            filtro.agregar("c")
+        filtro = FiltroBloom.cargar(ruta)
+        assert filtro.cantidad == 4 and "c" in filtro
+        copia = str(tmp_path / "copia.bin")
+        filtro.guardar(copia)
+        assert "b" in FiltroBloom.cargar(copia)
+        (tmp_path / "roto.bin").write_bytes(b"no es un filtro")
+        with pytest.raises(ValueError):
+            FiltroBloom.cargar(str(tmp_path / "roto.bin"))
@@ -1,5 +1,11 @@
+import math
+from array import array
+
 import pytest
-from src.magic.magic import Magic
+from src.magic.magic import (
+    Magic, BitsetPrimos, CachePisano, TablaAritmetica, TablaFactoriales, TokenCancelacion,
+    _LIMITE_SPF, _dividir_busqueda
+)
 
 class TestMagic:
     def setup_method(self):
@@ -13,6 +19,19 @@ class TestMagic:
         assert self.magic.fibonacci(3) == 2
         assert self.magic.fibonacci(10) == 55
         assert self.magic.fibonacci(10) != 35
+        # Test para índices grandes y negativos
+        assert self.magic.fibonacci(100) == 354224848179261915075
+        assert self.magic.fibonacci(-1) == 0
+    
+    def test_fibonacci_mod(self):
+        # Test contra el valor exacto reducido
+        for n in range(60):
+            assert self.magic.fibonacci_mod(n, 97) == self.magic.fibonacci(n) % 97
+        # Test para índices enormes sin enteros grandes
+        assert self.magic.fibonacci_mod(10**18, 10**9 + 7) == 209783453
+        assert self.magic.fibonacci_mod(10, 1) == 0
+        with pytest.raises(ValueError):
+            self.magic.fibonacci_mod(10, 0)
     
     def test_secuencia_fibonacci(self):
         # Test para generar secuencia de Fibonacci
@@ -20,6 +39,32 @@ class TestMagic:
         assert self.magic.secuencia_fibonacci(2) == [0, 1]
         assert self.magic.secuencia_fibonacci(5) == [0, 1, 1, 2, 3]
         assert self.magic.secuencia_fibonacci(8) == [0, 1, 1, 2, 3, 5, 8, 13]
+        assert self.magic.secuencia_fibonacci(0) == []
+        # Test para el modo perezoso
+        generador = self.magic.secuencia_fibonacci(6, perezosa=True)
+        assert next(generador) == 0
+        assert list(generador) == [1, 1, 2, 3, 5]
+    
+    def test_termino_recurrencia(self):
+        # Test para Lucas, Tribonacci y Pell
+        assert self.magic.secuencia_recurrencia((1, 1), (2, 1), 8) == [2, 1, 3, 4, 7, 11, 18, 29]
+        assert self.magic.secuencia_recurrencia((1, 1, 1), (0, 0, 1), 8) == [0, 0, 1, 1, 2, 4, 7, 13]
+        assert self.magic.termino_recurrencia((2, 1), (0, 1), 9) == 985
+        assert self.magic.termino_recurrencia((1, 1, 1), (0, 0, 1), 300) == \
+            self.magic.secuencia_recurrencia((1, 1, 1), (0, 0, 1), 301)[-1]
+        # Test con módulo contra la generación incremental
+        coeficientes = [(3 * i + 1) % 7 - 2 for i in range(40)]
+        iniciales = list(range(40))
+        secuencia = self.magic.secuencia_recurrencia(coeficientes, iniciales, 200, modulo=1000003)
+        assert [self.magic.termino_recurrencia(coeficientes, iniciales, n, 1000003) for n in (0, 39, 40, 199)] == \
+            [secuencia[0], secuencia[39], secuencia[40], secuencia[199]]
+        # Test para parámetros inválidos
+        with pytest.raises(ValueError):
+            self.magic.termino_recurrencia((1, 1), (0,), 5)
+        with pytest.raises(ValueError):
+            self.magic.termino_recurrencia((1, 1), (0, 1), -1)
+        with pytest.raises(ValueError):
+            self.magic.termino_recurrencia((1, 1), (0, 1), 5, modulo=0)
     
     def test_es_primo(self):
         # Test para números primos
@@ -32,6 +77,38 @@ class TestMagic:
         assert self.magic.es_primo(15) == False
         # Test para números negativos
         assert self.magic.es_primo(-5) == False
+        # Test con floats de valor entero a ambos lados de la tabla de primos pequeños
+        assert self.magic.es_primo(7.0) == True
+        assert self.magic.es_primo(257.0) == True
+        assert self.magic.es_primo(259.0) == False
+        with pytest.raises(TypeError):
+            self.magic.es_primo(257.5)
+    
+    def test_es_primo_grandes(self):
+        # Test para primos de Mersenne y primos de 64 bits
+        assert self.magic.es_primo(2**61 - 1) == True
+        assert self.magic.es_primo(10**18 + 9) == True
+        assert self.magic.es_primo(2**127 - 1) == True
+        # Test para pseudoprimos fuertes y números de Carmichael
+        assert self.magic.es_primo(561) == False
+        assert self.magic.es_primo(3215031751) == False
+        assert self.magic.es_primo(3825123056546413051) == False
+        assert self.magic.es_primo(318665857834031151167461) == False
+        # Test para compuestos mayores que 2^64
+        assert self.magic.es_primo((2**61 - 1) * (2**89 - 1)) == False
+        assert self.magic.es_primo(2**67 - 1) == False
+    
+    def test_es_primo_lote(self):
+        # Test con un lote denso (resuelto con criba)
+        numeros = list(range(-3, 1000))
+        assert self.magic.es_primo_lote(numeros) == [self.magic.es_primo(n) for n in numeros]
+        # Test con un lote disperso de números grandes
+        assert self.magic.es_primo_lote([2**61 - 1, 2**61 + 1, 97]) == [True, False, True]
+        # Test con lote vacío
+        assert self.magic.es_primo_lote([]) == []
+        # Test con lotes sin valores mayores que 1
+        assert self.magic.es_primo_lote([-5]) == [False]
+        assert self.magic.es_primo_lote([-7, 0, 1, -2]) == [False] * 4
     
     def test_generar_primos(self):
         # Test para generar números primos hasta n
@@ -40,6 +117,64 @@ class TestMagic:
         # Test para n < 2
         assert self.magic.generar_primos(1) == []
     
+    def test_generar_primos_compacto(self):
+        # Test para el modo compacto con array('Q')
+        primos = self.magic.generar_primos(30, compacto=True)
+        assert primos.typecode == 'Q'
+        assert list(primos) == [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+        assert len(self.magic.generar_primos(1, compacto=True)) == 0
+        # Test contra la prueba de primalidad más allá del primer segmento
+        primos = self.magic.generar_primos(300000)
+        assert len(primos) == 25997
+        assert primos[-1] == 299993
+    
+    def test_iter_primos(self):
+        # Test para intervalos [lo, hi)
+        assert list(self.magic.iter_primos(0, 10)) == [2, 3, 5, 7]
+        assert list(self.magic.iter_primos(2, 3)) == [2]
+        assert list(self.magic.iter_primos(7, 7)) == []
+        assert list(self.magic.iter_primos(10, 30)) == [11, 13, 17, 19, 23, 29]
+        # Test comparando con es_primo en intervalos que no empiezan en 0
+        for lo, hi in [(1, 2), (14, 15), (100, 400), (262140, 262200)]:
+            esperado = [x for x in range(lo, hi) if self.magic.es_primo(x)]
+            assert list(self.magic.iter_primos(lo, hi)) == esperado
+    
+    def test_iter_primos_paralelo(self, monkeypatch):
+        # Test con fragmentos pequeños para repartir el intervalo entre varios procesos
+        monkeypatch.setattr("src.magic.magic._TAMANO_FRAGMENTO", 1000)
+        for lo, hi in [(0, 50000), (30001, 61237)]:
+            assert list(self.magic.iter_primos(lo, hi, procesos=2)) == list(self.magic.iter_primos(lo, hi))
+        assert self.magic.generar_primos(20000, procesos=2) == self.magic.generar_primos(20000)
+        # Test para abandonar el generador antes de terminar
+        primos = self.magic.iter_primos(0, 10**6, procesos=2)
+        assert [next(primos), next(primos), next(primos)] == [2, 3, 5]
+        primos.close()
+    
+    def test_contar_primos(self):
+        # Test contra generar_primos
+        for x in (-1, 0, 1, 2, 3, 10, 100, 1000, 12345):
+            assert self.magic.contar_primos(x) == len(self.magic.generar_primos(x))
+        # Test para valores grandes
+        assert self.magic.contar_primos(10**9) == 50847534
+    
+    def test_contar_primos_sin_numpy(self, monkeypatch):
+        # Test para la versión en Python puro
+        monkeypatch.setattr("src.magic.magic.np", None)
+        assert self.magic.contar_primos(10**7) == 664579
+        assert self.magic.contar_primos(7919) == 1000
+    
+    def test_tabla_pi(self):
+        # Test para los puntos de control
+        assert self.magic.tabla_pi(50, 10) == {10: 4, 20: 8, 30: 10, 40: 12, 50: 15}
+        assert self.magic.tabla_pi(5, 10) == {}
+        # Test con muchos puntos de control contra generar_primos
+        primos = self.magic.generar_primos(100000)
+        tabla = self.magic.tabla_pi(100000, 7)
+        assert len(tabla) == 100000 // 7
+        assert all(cuenta == sum(1 for p in primos if p <= punto) for punto, cuenta in list(tabla.items())[::500])
+        with pytest.raises(ValueError):
+            self.magic.tabla_pi(10, 0)
+    
     def test_es_numero_perfecto(self):
         # Test para números perfectos
         assert self.magic.es_numero_perfecto(6) == True  # 1 + 2 + 3 = 6
@@ -50,6 +185,65 @@ class TestMagic:
         # Test para 0 y 1
         assert self.magic.es_numero_perfecto(0) == False
         assert self.magic.es_numero_perfecto(1) == False
+        # Test para perfectos grandes reconocidos por su forma
+        assert self.magic.es_numero_perfecto(2**126 * (2**127 - 1)) == True
+        assert self.magic.es_numero_perfecto(2**10 * (2**11 - 1)) == False  # 2^11 - 1 = 23 * 89
+        assert self.magic.es_numero_perfecto(945) == False  # Impar abundante
+    
+    def test_numeros_perfectos(self):
+        # Test para los primeros números perfectos
+        assert list(self.magic.numeros_perfectos(4)) == [6, 28, 496, 8128]
+        perfectos = list(self.magic.numeros_perfectos(12))
+        assert perfectos[-1] == 2**126 * (2**127 - 1)
+        assert all(self.magic.es_numero_perfecto(n) for n in perfectos)
+        assert list(self.magic.numeros_perfectos(0)) == []
+    
+    def test_criba_sigma(self):
+        # Test para la suma de divisores de los primeros números
+        assert list(self.magic.criba_sigma(12)) == [0, 1, 3, 4, 7, 6, 12, 8, 15, 13, 18, 12, 28]
+        assert self.magic.criba_sigma(12).typecode == 'Q'
+        assert list(self.magic.criba_sigma(0)) == [0]
+    
+    def test_perfectos_hasta(self):
+        # Test con bloques pequeños para forzar varios trozos
+        assert list(self.magic.perfectos_hasta(10000, tamano_bloque=1000)) == [[6, 28, 496], [8128]]
+        assert list(self.magic.perfectos_hasta(5)) == []
+    
+    def test_abundantes_hasta(self):
+        # Test para los primeros números abundantes
+        bloques = list(self.magic.abundantes_hasta(50, tamano_bloque=10))
+        assert bloques == [[12, 18, 20], [24, 30], [36, 40], [42, 48]]
+    
+    def test_amigos_hasta(self):
+        # Test para los primeros pares de números amigos
+        pares = [par for bloque in self.magic.amigos_hasta(10000) for par in bloque]
+        assert pares == [(220, 284), (1184, 1210), (2620, 2924), (5020, 5564), (6232, 6368)]
+        # Test con el compañero fuera del límite
+        assert list(self.magic.amigos_hasta(250)) == []
+    
+    def test_factorizar(self):
+        # Test para números pequeños (tabla de menor factor primo)
+        assert self.magic.factorizar(1) == {}
+        assert self.magic.factorizar(360) == {2: 3, 3: 2, 5: 1}
+        assert self.magic.factorizar(97) == {97: 1}
+        # Test para números grandes (Pollard-Brent rho)
+        assert self.magic.factorizar(2**64 + 1) == {274177: 1, 67280421310721: 1}
+        assert self.magic.factorizar(600851475143) == {71: 1, 839: 1, 1471: 1, 6857: 1}
+        assert self.magic.factorizar(2**20 * 3**5 * (10**9 + 7)) == {2: 20, 3: 5, 10**9 + 7: 1}
+        with pytest.raises(ValueError):
+            self.magic.factorizar(0)
+    
+    def test_factorizar_lote(self):
+        # Test contra factorizar uno a uno
+        numeros = [12, 1, 9973, 2**61 - 1, 1000003 * 1000033]
+        assert self.magic.factorizar_lote(numeros) == [self.magic.factorizar(n) for n in numeros]
+        assert self.magic.factorizar_lote([]) == []
+    
+    def test_factorizar_tras_tabla_aritmetica_pequena(self):
+        # Test para que una tabla aritmética pequeña no reemplace la tabla por defecto
+        self.magic.tabla_aritmetica(10)
+        assert self.magic.factorizar(2 * 3 * 99991) == {2: 1, 3: 1, 99991: 1}
+        assert len(self.magic._spf) > _LIMITE_SPF
     
     def test_triangulo_pascal(self):
         # Test para 1 fila
@@ -65,12 +259,55 @@ class TestMagic:
             [1, 4, 6, 4, 1]
         ]
     
+    def test_filas_pascal(self):
+        # Test para el generador perezoso
+        filas = self.magic.filas_pascal(4)
+        assert next(filas) == [1]
+        assert list(filas) == [[1, 1], [1, 2, 1], [1, 3, 3, 1]]
+        with pytest.raises(ValueError):
+            self.magic.filas_pascal(-1)
+    
+    def test_fila_pascal(self):
+        # Test para filas individuales
+        assert self.magic.fila_pascal(0) == [1]
+        assert self.magic.fila_pascal(1) == [1, 1]
+        assert self.magic.fila_pascal(4) == [1, 4, 6, 4, 1]
+        assert self.magic.fila_pascal(5) == [1, 5, 10, 10, 5, 1]
+        assert self.magic.fila_pascal(200) == [math.comb(200, j) for j in range(201)]
+    
+    def test_binomial_mod(self):
+        # Test contra math.comb
+        for p in (2, 3, 7):
+            for n in range(30):
+                for k in range(n + 1):
+                    assert self.magic.binomial_mod(n, k, p) == math.comb(n, k) % p
+        # Test para n enorme con el teorema de Lucas
+        # C(2*13^10 + 5, 13^10 + 3) = C(2, 1) * C(5, 3) = 20 = 7 (mod 13)
+        assert self.magic.binomial_mod(2 * 13**10 + 5, 13**10 + 3, 13) == 7
+        assert self.magic.binomial_mod(5, 7, 3) == 0
+        with pytest.raises(ValueError):
+            self.magic.binomial_mod(10, 3, 4)
+    
     def test_factorial(self):
         # Test para factorial
         assert self.magic.factorial(0) == 1
         assert self.magic.factorial(1) == 1
         assert self.magic.factorial(5) == 120
         assert self.magic.factorial(10) == 3628800
+        # Test para valores grandes contra math.factorial
+        assert self.magic.factorial(1000) == math.factorial(1000)
+        assert self.magic.factorial(-3) == 0
+    
+    def test_factorial_mod(self):
+        # Test contra el factorial exacto reducido
+        for m in (1, 12, 97):
+            for n in range(0, 100):
+                assert self.magic.factorial_mod(n, m) == math.factorial(n) % m
+        # Test para n cercano a un primo grande (teorema de Wilson)
+        assert self.magic.factorial_mod(1000002, 1000003) == 1000002
+        assert self.magic.factorial_mod(1000001, 1000003) == 1
+        with pytest.raises(ValueError):
+            self.magic.factorial_mod(5, 0)
     
     def test_mcd(self):
         # Test para máximo común divisor
@@ -86,12 +323,75 @@ class TestMagic:
         assert self.magic.mcm(7, 13) == 91
         assert self.magic.mcm(5, 0) == 0
     
+    def test_mcd_lote(self):
+        # Test con array.array (conserva el tipo)
+        resultado = self.magic.mcd_lote(array('q', [48, 15, 7, 0]), array('q', [18, 25, 13, 5]))
+        assert resultado == array('q', [6, 5, 1, 5])
+        # Test con listas de distinta longitud
+        with pytest.raises(ValueError):
+            self.magic.mcd_lote([1, 2], [3])
+    
+    def test_mcm_lote(self):
+        # Test con listas
+        assert self.magic.mcm_lote([4, 15, 7, 5], [6, 25, 13, 0]) == [12, 75, 91, 0]
+    
+    @pytest.mark.parametrize("sin_numpy", [False, True])
+    def test_lote_array_ampliado(self, monkeypatch, sin_numpy):
+        # Test con array.array, con y sin NumPy: el mcm se guarda en 64 bits
+        if sin_numpy:
+            monkeypatch.setattr("src.magic.magic.np", None)
+        assert self.magic.mcm_lote(array('i', [100000, 4]), array('i', [99999, 6])) == array('q', [9999900000, 12])
+        assert self.magic.mcm_lote(array('H', [4, 6]), array('B', [6, 9])) == array('Q', [12, 18])
+        assert self.magic.mcd_lote(array('b', [-128, 4]), array('b', [0, 6])).tolist() == [128, 2]
+        assert self.magic.mcd_lote(array('q', [48, 0]), array('q', [18, 5])) == array('q', [6, 5])
+    
+    def test_lote_numpy(self):
+        # Test con arreglos de NumPy (solo si está instalado)
+        np = pytest.importorskip("numpy")
+        a = np.array([48, 15, 7, 0])
+        b = np.array([18, 25, 13, 5])
+        assert self.magic.mcd_lote(a, b).tolist() == [6, 5, 1, 5]
+        assert self.magic.mcm_lote(a, b).tolist() == [144, 75, 91, 0]
+    
+    def test_mcd_muchos(self):
+        # Test para varios números
+        assert self.magic.mcd_muchos(48, 18, 30) == 6
+        assert self.magic.mcd_muchos(12, 18, 7, 100) == 1
+        assert self.magic.mcd_muchos(-5) == 5
+        assert self.magic.mcd_muchos() == 0
+    
+    def test_mcm_muchos(self):
+        # Test para varios números
+        assert self.magic.mcm_muchos(4, 6, 10) == 60
+        assert self.magic.mcm_muchos(3, 0, 5) == 0
+        assert self.magic.mcm_muchos() == 1
+    
     def test_suma_digitos(self):
         # Test para suma de dígitos
         assert self.magic.suma_digitos(123) == 6
         assert self.magic.suma_digitos(9999) == 36
         assert self.magic.suma_digitos(0) == 0
         assert self.magic.suma_digitos(7) == 7
+        # Test para negativos y enteros muy grandes
+        assert self.magic.suma_digitos(-123) == 6
+        assert self.magic.suma_digitos(10**2000 - 1) == 9 * 2000
+        assert self.magic.suma_digitos(12 * 10**1500 + 34) == 10
+    
+    def test_suma_digitos_rango(self):
+        # Test contra la suma uno a uno
+        for a, b in [(0, 0), (1, 9), (5, 1234), (-20, 15), (-99, -10)]:
+            assert self.magic.suma_digitos_rango(a, b) == sum(self.magic.suma_digitos(k) for k in range(a, b + 1))
+        # Test para intervalos enormes e invertidos
+        assert self.magic.suma_digitos_rango(1, 10**18) == 81 * 10**18 + 1
+        assert self.magic.suma_digitos_rango(10, 5) == 0
+    
+    def test_contar_con_suma_digitos(self):
+        # Test contra el conteo uno a uno
+        for a, b, objetivo in [(0, 1000, 10), (37, 4321, 5), (-50, 50, 4), (0, 9, 0)]:
+            esperado = sum(1 for k in range(a, b + 1) if self.magic.suma_digitos(k) == objetivo)
+            assert self.magic.contar_con_suma_digitos(a, b, objetivo) == esperado
+        # Test para un intervalo enorme: solo 10^18 - 1 tiene 18 nueves
+        assert self.magic.contar_con_suma_digitos(0, 10**18, 162) == 1
     
     def test_es_numero_armstrong(self):
         # Test para números de Armstrong
@@ -102,6 +402,15 @@ class TestMagic:
         assert self.magic.es_numero_armstrong(123) == False
         assert self.magic.es_numero_armstrong(100) == False
     
+    def test_armstrong_hasta(self):
+        # Test para números de hasta 4 cifras
+        assert self.magic.armstrong_hasta(4) == list(range(10)) + [153, 370, 371, 407, 1634, 8208, 9474]
+        # Test contra es_numero_armstrong por fuerza bruta
+        assert self.magic.armstrong_hasta(5) == [n for n in range(100000) if self.magic.es_numero_armstrong(n)]
+        # Test para longitudes grandes
+        assert self.magic.armstrong_hasta(11)[-1] == 94204591914
+        assert self.magic.armstrong_hasta(0) == []
+    
     def test_es_cuadrado_magico(self):
         # Test para cuadrado mágico 3x3
         cuadrado_magico = [
@@ -120,4 +429,248 @@ class TestMagic:
         assert self.magic.es_cuadrado_magico(no_magico) == False
         
         # Test para cuadrado mágico 1x1
-        assert self.magic.es_cuadrado_magico([[5]]) == True
\ No newline at end of file
+        assert self.magic.es_cuadrado_magico([[5]]) == True
+    
+    def test_es_cuadrado_magico_numpy(self):
+        # Test con arreglos de NumPy (solo si está instalado)
+        np = pytest.importorskip("numpy")
+        n = 51
+        # Cuadrado mágico impar construido con una fórmula cerrada
+        cuadrado = [[n * ((i + j - 1 + n // 2) % n) + ((i + 2 * j - 2) % n) + 1
+                     for j in range(1, n + 1)] for i in range(1, n + 1)]
+        assert self.magic.es_cuadrado_magico(np.array(cuadrado)) == True
+        assert self.magic.es_cuadrado_magico(cuadrado) == True
+        # Test con dos elementos intercambiados
+        cuadrado[0][0], cuadrado[0][1] = cuadrado[0][1], cuadrado[0][0]
+        assert self.magic.es_cuadrado_magico(np.array(cuadrado)) == False
+        assert self.magic.es_cuadrado_magico(cuadrado) == False
+        # Test con sumas correctas pero números repetidos
+        assert self.magic.es_cuadrado_magico(np.full((3, 3), 5)) == False
+        # Test con formas inválidas
+        assert self.magic.es_cuadrado_magico(np.arange(9)) == False
+        assert self.magic.es_cuadrado_magico(np.ones((2, 3), dtype=int)) == False
+        assert self.magic.es_cuadrado_magico(np.array([[5]])) == True
+
+    
+    def test_filas_cuadrado_magico(self):
+        # Test para órdenes impares, múltiplos de 4 y de la forma 4m + 2
+        for n in (1, 3, 4, 5, 6, 8, 10, 14):
+            filas = [list(fila) for fila in self.magic.filas_cuadrado_magico(n)]
+            assert self.magic.es_cuadrado_magico(filas) == True
+        # Test para el método siamés de orden 3
+        assert [list(fila) for fila in self.magic.filas_cuadrado_magico(3)] == [[8, 1, 6], [3, 5, 7], [4, 9, 2]]
+        # Test para un orden sin cuadrado mágico
+        with pytest.raises(ValueError):
+            self.magic.filas_cuadrado_magico(2)
+    
+    def test_generar_cuadrado_magico(self):
+        # Test para los tres métodos de construcción
+        for n in (3, 12, 18, 101, 200, 202):
+            cuadrado = self.magic.generar_cuadrado_magico(n)
+            assert self.magic.es_cuadrado_magico(cuadrado) == True
+            assert [list(fila) for fila in cuadrado] == [list(fila) for fila in self.magic.filas_cuadrado_magico(n)]
+        with pytest.raises(ValueError):
+            self.magic.generar_cuadrado_magico(0)
+    
+    def test_buscar_cuadrados_magicos(self):
+        # Test para los 8 cuadrados mágicos de orden 3
+        resultado = self.magic.buscar_cuadrados_magicos(3, procesos=1)
+        assert resultado["cantidad"] == 8
+        assert resultado["completa"] == True
+        assert all(self.magic.es_cuadrado_magico(c) for c in resultado["cuadrados"])
+        assert resultado["nodos"] > 0 and resultado["nodos_por_segundo"] > 0
+        # Test con celdas fijas
+        resultado = self.magic.buscar_cuadrados_magicos(3, fijas={(0, 0): 2, (1, 1): 5}, procesos=1)
+        assert resultado["cuadrados"] == [[[2, 7, 6], [9, 5, 1], [4, 3, 8]], [[2, 9, 4], [7, 5, 3], [6, 1, 8]]]
+        assert self.magic.buscar_cuadrados_magicos(3, fijas={(0, 0): 5}, procesos=1)["cantidad"] == 0
+        # Test de conteo con celdas fijas en orden 4
+        resultado = self.magic.buscar_cuadrados_magicos(4, fijas={(0, 0): 1, (0, 1): 15}, procesos=1, solo_contar=True)
+        assert resultado["cantidad"] == 48
+        assert resultado["cuadrados"] == []
+        # Test con celdas fijas inválidas
+        with pytest.raises(ValueError):
+            self.magic.buscar_cuadrados_magicos(3, fijas={(3, 0): 1})
+        with pytest.raises(ValueError):
+            self.magic.buscar_cuadrados_magicos(3, fijas={(0, 0): 1, (0, 1): 1})
+    
+    def test_buscar_cuadrados_magicos_paralelo(self):
+        # Test repartiendo la búsqueda entre procesos
+        serie = self.magic.buscar_cuadrados_magicos(3, procesos=1)
+        paralelo = self.magic.buscar_cuadrados_magicos(3, procesos=2)
+        assert sorted(paralelo["cuadrados"]) == sorted(serie["cuadrados"])
+        assert paralelo["completa"] == True
+        # Test con límite de cuadrados
+        resultado = self.magic.buscar_cuadrados_magicos(4, procesos=2, limite=5)
+        assert resultado["cantidad"] == 5 and len(resultado["cuadrados"]) == 5
+    
+    def test_buscar_cuadrados_magicos_division_con_fijas(self):
+        # Test para que las celdas fijas no dejen una sola unidad de trabajo
+        for fijas in ({0: 1, 1: 15}, {0: 1, 1: 15, 5: 6}):
+            assert len(_dividir_busqueda(4, fijas, 8)["prefijos"]) >= 8
+        fijas = {(0, 0): 1, (0, 1): 15, (1, 1): 6}
+        serie = self.magic.buscar_cuadrados_magicos(4, fijas=fijas, procesos=1)
+        paralelo = self.magic.buscar_cuadrados_magicos(4, fijas=fijas, procesos=2)
+        assert sorted(paralelo["cuadrados"]) == sorted(serie["cuadrados"])
+    
+    def test_buscar_cuadrados_magicos_cancelacion(self):
+        # Test con un token ya cancelado
+        token = TokenCancelacion()
+        token.cancelar()
+        assert token.cancelado() == True
+        resultado = self.magic.buscar_cuadrados_magicos(5, procesos=1, token=token)
+        assert resultado["completa"] == False
+        # Test con tiempo límite vencido
+        resultado = self.magic.buscar_cuadrados_magicos(5, procesos=1, tiempo_limite=0)
+        assert resultado["completa"] == False
+        assert TokenCancelacion(tiempo_limite=60).cancelado() == False
+
+class TestCachePisano:
+    def setup_method(self):
+        self.magic = Magic()
+        self.cache = CachePisano(capacidad=2)
+    
+    def test_periodo(self):
+        # Test para los primeros periodos de Pisano
+        assert [self.cache.periodo(m) for m in range(1, 11)] == [1, 3, 8, 6, 20, 24, 16, 12, 24, 60]
+        with pytest.raises(ValueError):
+            self.cache.periodo(0)
+    
+    def test_fibonacci_mod(self):
+        # Test contra Magic.fibonacci_mod
+        for m in (2, 10, 1000):
+            for n in (0, 1, 59, 10**18):
+                assert self.cache.fibonacci_mod(n, m) == self.magic.fibonacci_mod(n, m)
+    
+    def test_estadisticas(self):
+        # Test de aciertos, fallos y expulsión LRU
+        self.cache.fibonacci_mod(5, 10)
+        self.cache.fibonacci_mod(7, 10)
+        self.cache.fibonacci_mod(7, 11)
+        self.cache.fibonacci_mod(7, 10)
+        self.cache.fibonacci_mod(7, 12)  # Expulsa al módulo 11
+        self.cache.fibonacci_mod(7, 11)
+        assert self.cache.estadisticas() == {
+            "aciertos": 2,
+            "fallos": 4,
+            "tamano": 2,
+            "capacidad": 2
+        }
+
+
+class TestTablaFactoriales:
+    def setup_method(self):
+        self.p = 10**9 + 7
+        self.tabla = TablaFactoriales(100, self.p)
+    
+    def test_factoriales(self):
+        # Test para factoriales e inversos módulo p
+        assert self.tabla.factorial(20) == math.factorial(20) % self.p
+        assert self.tabla.factorial(20) * self.tabla.inverso_factorial(20) % self.p == 1
+    
+    def test_combinaciones(self):
+        # Test contra math.comb y math.perm
+        assert self.tabla.combinaciones(100, 50) == math.comb(100, 50) % self.p
+        assert self.tabla.permutaciones(100, 7) == math.perm(100, 7) % self.p
+        assert self.tabla.combinaciones(10, 11) == 0
+        assert self.tabla.combinaciones(10, -1) == 0
+    
+    def test_modulo_invalido(self):
+        # Test para módulos no primos o menores que n
+        with pytest.raises(ValueError):
+            TablaFactoriales(10, 12)
+        with pytest.raises(ValueError):
+            TablaFactoriales(10, 7)
+
+
+class TestBitsetPrimos:
+    def setup_method(self):
+        self.magic = Magic()
+    
+    def test_construir_y_consultar(self, tmp_path):
+        # Test contra la criba en memoria
+        ruta = str(tmp_path / "primos.bin")
+        with BitsetPrimos.construir(ruta, 10000) as tabla:
+            assert tabla.limite == 10000
+            assert list(tabla.iter_primos(0, 10001)) == self.magic.generar_primos(10000)
+            assert list(tabla.iter_primos(7900, 8000)) == list(self.magic.iter_primos(7900, 8000))
+            assert [tabla.es_primo(n) for n in range(-2, 50)] == [self.magic.es_primo(n) for n in range(-2, 50)]
+    
+    def test_extender(self, tmp_path):
+        # Test para la extensión incremental de una tabla existente
+        ruta = str(tmp_path / "primos.bin")
+        BitsetPrimos.construir(ruta, 1003).cerrar()
+        with BitsetPrimos.construir(ruta, 5000) as tabla, BitsetPrimos(ruta) as reabierta:
+            assert reabierta.limite == 5000
+            assert list(tabla.iter_primos(0, 5001)) == self.magic.generar_primos(5000)
+        # Un límite menor reutiliza la tabla sin recortarla
+        with BitsetPrimos.construir(ruta, 100) as tabla:
+            assert tabla.limite == 5000
+    
+    def test_fuera_de_limite(self, tmp_path):
+        # Test para consultas más allá del límite
+        with BitsetPrimos.construir(str(tmp_path / "primos.bin"), 100) as tabla:
+            with pytest.raises(ValueError):
+                tabla.es_primo(101)
+            with pytest.raises(ValueError):
+                list(tabla.iter_primos(0, 102))
+    
+    def test_archivo_corrupto(self, tmp_path):
+        # Test para la validación de la cabecera y del CRC
+        ruta = tmp_path / "primos.bin"
+        BitsetPrimos.construir(str(ruta), 1000).cerrar()
+        datos = bytearray(ruta.read_bytes())
+        datos[40] ^= 0xFF
+        ruta.write_bytes(bytes(datos))
+        with pytest.raises(ValueError):
+            BitsetPrimos(str(ruta))
+        ruta.write_bytes(b"NOPRIMOS" + bytes(datos[8:]))
+        with pytest.raises(ValueError):
+            BitsetPrimos(str(ruta))
+        for contenido in (b"", b"PRIM"):
+            corto = tmp_path / "corto.bin"
+            corto.write_bytes(contenido)
+            with pytest.raises(ValueError, match="no es una tabla de primos"):
+                BitsetPrimos(str(corto))
+
+
+class TestTablaAritmetica:
+    def setup_method(self):
+        self.tabla = TablaAritmetica(1000)
+    
+    def test_funciones(self):
+        # Test contra las definiciones directas
+        for n in range(1, 200):
+            divisores = [d for d in range(1, n + 1) if n % d == 0]
+            assert self.tabla.cantidad_divisores(n) == len(divisores)
+            assert self.tabla.phi(n) == sum(1 for k in range(1, n + 1) if math.gcd(n, k) == 1)
+        assert [self.tabla.mobius(n) for n in range(1, 11)] == [1, -1, -1, 0, -1, 1, -1, 0, 0, 1]
+        assert [self.tabla.menor_factor_primo(n) for n in (1, 2, 91, 997, 1000)] == [1, 2, 7, 997, 2]
+        with pytest.raises(ValueError):
+            self.tabla.phi(1001)
+        with pytest.raises(ValueError):
+            self.tabla.mobius(0)
+    
+    def test_persistencia(self, tmp_path):
+        # Test para guardar y volver a cargar las tablas
+        ruta = tmp_path / "aritmetica.bin"
+        self.tabla.guardar(str(ruta))
+        cargada = TablaAritmetica.cargar(str(ruta))
+        assert cargada.limite == 1000
+        assert [cargada.phi(n) for n in range(1, 1001)] == [self.tabla.phi(n) for n in range(1, 1001)]
+        assert [cargada.cantidad_divisores(n) for n in range(1, 1001)] == \
+            [self.tabla.cantidad_divisores(n) for n in range(1, 1001)]
+        datos = bytearray(ruta.read_bytes())
+        datos[-1] ^= 1
+        ruta.write_bytes(bytes(datos))
+        with pytest.raises(ValueError):
+            TablaAritmetica.cargar(str(ruta))
+    
+    def test_cache_en_magic(self, tmp_path):
+        # Test para la caché de Magic y su uso en factorizar
+        magic = Magic()
+        ruta = str(tmp_path / "aritmetica.bin")
+        tabla = magic.tabla_aritmetica(5000, ruta)
+        assert magic.tabla_aritmetica(100) is tabla
+        assert magic.factorizar(4096) == {2: 12}
+        # Otra instancia lee las tablas del disco
+        assert Magic().tabla_aritmetica(3000, ruta).limite == 5000